@@ -1,19 +1,28 @@
 """Multi-agent system for ExplainStack."""
 
-from .base_agent import BaseAgent
-from .code_expert import CodeExpertAgent
-from .patch_reviewer import PatchReviewerAgent
-from .import_cleaner import ImportCleanerAgent
-from .commit_writer import CommitWriterAgent
-from .security_expert import SecurityExpertAgent
-from .performance_expert import PerformanceExpertAgent
+import importlib
 
-__all__ = [
-    'BaseAgent',
-    'CodeExpertAgent', 
-    'PatchReviewerAgent',
-    'ImportCleanerAgent',
-    'CommitWriterAgent',
-    'SecurityExpertAgent',
-    'PerformanceExpertAgent'
-]
+# Agents are imported on first access so that callers needing a single agent
+# don't pay for importing every agent module
+_LAZY_AGENTS = {
+    'BaseAgent': '.base_agent',
+    'CodeExpertAgent': '.code_expert',
+    'PatchReviewerAgent': '.patch_reviewer',
+    'ImportCleanerAgent': '.import_cleaner',
+    'CommitWriterAgent': '.commit_writer',
+    'SecurityExpertAgent': '.security_expert',
+    'PerformanceExpertAgent': '.performance_expert'
+}
+
+__all__ = list(_LAZY_AGENTS)
+
+
+def __getattr__(name):
+    """Import agent classes lazily on first attribute access."""
+    if name not in _LAZY_AGENTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY_AGENTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
@@ -1,8 +1,12 @@
 """Base agent class for ExplainStack multi-agent system."""
 
+import asyncio
+import hashlib
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 from ..backends import BaseBackend
 
 logger = logging.getLogger(__name__)
@@ -11,6 +15,12 @@ logger = logging.getLogger(__name__)
 class BaseAgent(ABC):
     """Base class for all ExplainStack agents."""
     
+    # Successful responses are shared between agent instances, since agents
+    # are recreated whenever the configuration is rebuilt
+    RESPONSE_CACHE_SIZE = 256
+    RESPONSE_CACHE_TTL = 600  # seconds
+    _response_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, str]]" = OrderedDict()
+    
     def __init__(self, name: str, description: str, backend: BaseBackend):
         """Initialize the agent.
         
@@ -23,6 +33,13 @@ class BaseAgent(ABC):
         self.description = description
         self.backend = backend
         self.logger = logging.getLogger(f"{__name__}.{name}")
+        # System prompts are constant per agent, build them only once
+        self._system_prompt = self.get_system_prompt()
+        self._info = {
+            "name": self.name,
+            "description": self.description,
+            "id": self.name.lower().replace(" ", "_")
+        }
     
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -34,11 +51,20 @@ class BaseAgent(ABC):
         """Get the user prompt for this agent."""
         pass
     
-    async def process(self, user_input: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    async def process(
+        self,
+        user_input: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
         """Process user input with this agent.
         
         Args:
             user_input: User's input text
+            on_token: Optional coroutine called with each response chunk as it
+                is generated, if the backend supports streaming
+            usage: Optional dictionary filled with the backend's token counts,
+                left empty when the response comes from the cache
             
         Returns:
             Tuple of (success, response, error_message)
@@ -46,16 +72,28 @@ class BaseAgent(ABC):
         try:
             self.logger.info(f"Processing with {self.name} agent using {self.backend.name} backend")
             
-            system_prompt = self.get_system_prompt()
+            cache_key = self._get_cache_key(user_input) if self.backend.cacheable else None
+            if cache_key is not None:
+                cached_result = self._get_cached_response(cache_key)
+                if cached_result is not None:
+                    self.logger.info(f"{self.name} agent served response from cache")
+                    return True, cached_result, None
+            
+            system_prompt = self._system_prompt
             user_prompt = self.get_user_prompt(user_input)
             
             # Use the configured backend
+            kwargs = {"on_token": on_token} if on_token and self.backend.supports_streaming else {}
+            if usage is not None:
+                kwargs["usage"] = usage
             success, result, error_msg = await self.backend.generate_response(
-                system_prompt, user_prompt
+                system_prompt, user_prompt, **kwargs
             )
             
             if success:
                 self.logger.info(f"{self.name} agent processed successfully")
+                if cache_key is not None:
+                    self._cache_response(cache_key, result)
                 return True, result, None
             else:
                 self.logger.error(f"{self.name} agent failed: {error_msg}")
@@ -66,10 +104,67 @@ class BaseAgent(ABC):
             self.logger.error(f"Unexpected error in {self.name}: {e}")
             return False, None, error_msg
     
+    def _get_cache_key(self, user_input: str) -> Tuple[Any, ...]:
+        """Build the response cache key for user input.
+        
+        The key includes a digest of the backend's API key, so responses are
+        only shared between requests made with the same credentials.
+        """
+        digest = hashlib.blake2b(user_input.encode("utf-8"), digest_size=16).digest()
+        credential = hashlib.blake2b(
+            str(self.backend.config.get("api_key", "")).encode("utf-8"), digest_size=16
+        ).digest()
+        return (self.name, self.backend.name, self.backend.config.get("model"), credential, digest)
+    
+    def _get_cached_response(self, cache_key: Tuple[Any, ...]) -> Optional[str]:
+        """Get a cached response if it has not expired."""
+        entry = self._response_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        cached_at, result = entry
+        if time.monotonic() - cached_at > self.RESPONSE_CACHE_TTL:
+            del self._response_cache[cache_key]
+            return None
+        
+        self._response_cache.move_to_end(cache_key)
+        return result
+    
+    def _cache_response(self, cache_key: Tuple[Any, ...], result: str) -> None:
+        """Store a response, evicting the least recently used entries."""
+        self._response_cache[cache_key] = (time.monotonic(), result)
+        self._response_cache.move_to_end(cache_key)
+        while len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    @staticmethod
+    async def process_many(
+        agents: Sequence["BaseAgent"], user_input: str
+    ) -> List[Tuple[bool, Optional[str], Optional[str]]]:
+        """Process the same input with several agents concurrently.
+        
+        Args:
+            agents: Agents to run
+            user_input: User's input text
+            
+        Returns:
+            List of (success, response, error_message) tuples, in agent order
+        """
+        results = await asyncio.gather(
+            *(agent.process(user_input) for agent in agents),
+            return_exceptions=True
+        )
+        
+        return [
+            (False, None, f"Unexpected error in {agent.name}: {result}")
+            if isinstance(result, BaseException) else result
+            for agent, result in zip(agents, results)
+        ]
+    
     def get_info(self) -> Dict[str, str]:
-        """Get agent information for UI."""
-        return {
-            "name": self.name,
-            "description": self.description,
-            "id": self.name.lower().replace(" ", "_")
-        }
+        """Get agent information for UI.
+        
+        Returns:
+            Shared info dictionary, which callers must not modify
+        """
+        return self._info
@@ -6,6 +6,23 @@ from .base_agent import BaseAgent
 class CodeExpertAgent(BaseAgent):
     """Agent specialized in explaining Python code."""
     
+    USER_PROMPT_TEMPLATE = """Please analyze and explain this Python code:
+
+```python
+{user_input}
+```
+
+Provide your analysis in the following structure:
+
+- 📝 **Summary**: What this code does in 1-2 sentences
+- 🔍 **Detailed Explanation**: Line-by-line or block-by-block breakdown
+- 💡 **Key Insights**: Important patterns, techniques, or concepts used
+- 📘 **Suggested Docstring**: A professional docstring for the main function/class
+- ⚠️ **Potential Issues**: Any problems or improvements you notice
+- 🚀 **OpenStack Context**: How this relates to OpenStack development (if applicable)
+
+Focus on being educational and helping the developer understand both the code and best practices."""
+    
     def __init__(self, backend):
         super().__init__(
             name="Code Expert",
@@ -33,19 +50,4 @@ Always be professional, helpful, and focus on educational value."""
     
     def get_user_prompt(self, user_input: str) -> str:
         """Get the user prompt for code explanation."""
-        return f"""Please analyze and explain this Python code:
-
-```python
-{user_input}
-```
-
-Provide your analysis in the following structure:
-
-- 📝 **Summary**: What this code does in 1-2 sentences
-- 🔍 **Detailed Explanation**: Line-by-line or block-by-block breakdown
-- 💡 **Key Insights**: Important patterns, techniques, or concepts used
-- 📘 **Suggested Docstring**: A professional docstring for the main function/class
-- ⚠️ **Potential Issues**: Any problems or improvements you notice
-- 🚀 **OpenStack Context**: How this relates to OpenStack development (if applicable)
-
-Focus on being educational and helping the developer understand both the code and best practices."""
+        return self.USER_PROMPT_TEMPLATE.format(user_input=user_input)
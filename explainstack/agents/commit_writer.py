@@ -6,6 +6,31 @@ from .base_agent import BaseAgent
 class CommitWriterAgent(BaseAgent):
     """Agent specialized in writing professional commit messages."""
     
+    USER_PROMPT_TEMPLATE = """Please write a professional commit message for this change:
+
+```
+{user_input}
+```
+
+**Requirements:**
+- Use conventional commit format: `type(scope): description`
+- Types: feat, fix, docs, style, refactor, test, chore, perf, ci
+- Use present tense ("Add feature" not "Added feature")
+- Keep first line under 50 characters
+- Add detailed body if needed (separated by blank line)
+- Reference bug numbers if applicable: "Fixes: #12345"
+- Follow OpenStack conventions
+
+**Response Format:**
+- **Commit Message**: [The suggested commit message]
+- **Type**: [feat/fix/docs/style/refactor/test/chore/perf/ci]
+- **Scope**: [component or module affected]
+- **Explanation**: [Why this message works well]
+- **Alternative Options**: [Other good commit message options]
+- **OpenStack Context**: [How this follows OpenStack conventions]
+
+Focus on creating clear, professional commit messages that help other developers understand the change."""
+    
     def __init__(self, backend):
         super().__init__(
             name="Commit Writer",
@@ -37,27 +62,4 @@ Always provide multiple options when appropriate and explain the reasoning behin
     
     def get_user_prompt(self, user_input: str) -> str:
         """Get the user prompt for commit message writing."""
-        return f"""Please write a professional commit message for this change:
-
-```
-{user_input}
-```
-
-**Requirements:**
-- Use conventional commit format: `type(scope): description`
-- Types: feat, fix, docs, style, refactor, test, chore, perf, ci
-- Use present tense ("Add feature" not "Added feature")
-- Keep first line under 50 characters
-- Add detailed body if needed (separated by blank line)
-- Reference bug numbers if applicable: "Fixes: #12345"
-- Follow OpenStack conventions
-
-**Response Format:**
-- **Commit Message**: [The suggested commit message]
-- **Type**: [feat/fix/docs/style/refactor/test/chore/perf/ci]
-- **Scope**: [component or module affected]
-- **Explanation**: [Why this message works well]
-- **Alternative Options**: [Other good commit message options]
-- **OpenStack Context**: [How this follows OpenStack conventions]
-
-Focus on creating clear, professional commit messages that help other developers understand the change."""
+        return self.USER_PROMPT_TEMPLATE.format(user_input=user_input)
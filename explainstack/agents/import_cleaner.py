@@ -6,6 +6,35 @@ from .base_agent import BaseAgent
 class ImportCleanerAgent(BaseAgent):
     """Agent specialized in cleaning and organizing Python imports."""
     
+    USER_PROMPT_TEMPLATE = """Please clean and organize the imports in this Python code:
+
+```python
+{user_input}
+```
+
+Provide the cleaned imports following OpenStack HACKING guidelines:
+
+**Requirements:**
+1. Remove any unused imports
+2. Group imports in this order:
+   - Standard library imports
+   - Third-party package imports  
+   - OpenStack-specific or project-internal imports
+3. Sort imports alphabetically within each group
+4. Leave one blank line between each group
+5. Each import should be on its own line
+6. No wildcard imports (import *)
+7. No relative imports unless strictly necessary
+8. Preserve meaningful comments
+
+**Response Format:**
+- **Cleaned Imports**: The reorganized import section
+- **Changes Made**: Detailed list of what was changed
+- **OpenStack Compliance**: How this follows HACKING guidelines
+- **Best Practices**: Additional recommendations for import management
+
+Focus on making the imports clean, organized, and compliant with OpenStack standards."""
+    
     def __init__(self, backend):
         super().__init__(
             name="Import Cleaner",
@@ -36,31 +65,4 @@ Always follow OpenStack HACKING guidelines and provide clear explanations of cha
     
     def get_user_prompt(self, user_input: str) -> str:
         """Get the user prompt for import cleaning."""
-        return f"""Please clean and organize the imports in this Python code:
-
-```python
-{user_input}
-```
-
-Provide the cleaned imports following OpenStack HACKING guidelines:
-
-**Requirements:**
-1. Remove any unused imports
-2. Group imports in this order:
-   - Standard library imports
-   - Third-party package imports  
-   - OpenStack-specific or project-internal imports
-3. Sort imports alphabetically within each group
-4. Leave one blank line between each group
-5. Each import should be on its own line
-6. No wildcard imports (import *)
-7. No relative imports unless strictly necessary
-8. Preserve meaningful comments
-
-**Response Format:**
-- **Cleaned Imports**: The reorganized import section
-- **Changes Made**: Detailed list of what was changed
-- **OpenStack Compliance**: How this follows HACKING guidelines
-- **Best Practices**: Additional recommendations for import management
-
-Focus on making the imports clean, organized, and compliant with OpenStack standards."""
+        return self.USER_PROMPT_TEMPLATE.format(user_input=user_input)
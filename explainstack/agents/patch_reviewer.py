@@ -6,6 +6,26 @@ from .base_agent import BaseAgent
 class PatchReviewerAgent(BaseAgent):
     """Agent specialized in reviewing Gerrit patches."""
     
+    USER_PROMPT_TEMPLATE = """Please review this Gerrit patch:
+
+```
+{user_input}
+```
+
+Provide a comprehensive review in the following structure:
+
+- 📋 **Summary**: High-level overview of what this patch changes
+- 📁 **File-by-File Analysis**: Detailed breakdown of changes in each file
+- ✅ **Positive Aspects**: What's done well in this patch
+- ⚠️ **Issues Found**: Problems, bugs, or concerns identified
+- 🔒 **Security Review**: Security implications and recommendations
+- 🚀 **Performance Impact**: Performance considerations and optimizations
+- 📝 **Style & Standards**: Compliance with OpenStack HACKING guidelines
+- 💡 **Suggestions**: Specific recommendations for improvement
+- 🧪 **Testing**: Suggestions for additional tests or validation
+
+Focus on being constructive and helping the developer improve their contribution."""
+    
     def __init__(self, backend):
         super().__init__(
             name="Patch Reviewer",
@@ -35,22 +55,4 @@ Be thorough, constructive, and focus on helping improve the code quality."""
     
     def get_user_prompt(self, user_input: str) -> str:
         """Get the user prompt for patch review."""
-        return f"""Please review this Gerrit patch:
-
-```
-{user_input}
-```
-
-Provide a comprehensive review in the following structure:
-
-- 📋 **Summary**: High-level overview of what this patch changes
-- 📁 **File-by-File Analysis**: Detailed breakdown of changes in each file
-- ✅ **Positive Aspects**: What's done well in this patch
-- ⚠️ **Issues Found**: Problems, bugs, or concerns identified
-- 🔒 **Security Review**: Security implications and recommendations
-- 🚀 **Performance Impact**: Performance considerations and optimizations
-- 📝 **Style & Standards**: Compliance with OpenStack HACKING guidelines
-- 💡 **Suggestions**: Specific recommendations for improvement
-- 🧪 **Testing**: Suggestions for additional tests or validation
-
-Focus on being constructive and helping the developer improve their contribution."""
+        return self.USER_PROMPT_TEMPLATE.format(user_input=user_input)
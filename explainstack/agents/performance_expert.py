@@ -6,6 +6,35 @@ from .base_agent import BaseAgent
 class PerformanceExpertAgent(BaseAgent):
     """Agent specialized in performance analysis and code optimization."""
     
+    USER_PROMPT_TEMPLATE = """Please perform a comprehensive performance analysis of this code:
+
+```python
+{user_input}
+```
+
+Provide your performance analysis in the following structure:
+
+- ⚡ **Performance Summary**: Overall performance assessment
+- 🐌 **Bottlenecks Found**: List of performance issues with severity levels
+- 🚀 **Optimization Opportunities**: Specific recommendations for improvement
+- 📊 **OpenStack Performance**: Specific OpenStack performance considerations
+- 🔧 **Code Optimizations**: Specific code changes with examples
+- 📈 **Scalability Notes**: Scalability and resource utilization recommendations
+- 🧪 **Testing Strategy**: Performance testing and benchmarking suggestions
+- 📚 **Additional Resources**: Links to performance tools and documentation
+
+Focus on:
+- Algorithm complexity and efficiency
+- Memory usage and garbage collection
+- Database query optimization
+- I/O operations and network calls
+- Caching strategies
+- OpenStack-specific performance patterns
+- Resource utilization and scalability
+- Profiling and monitoring recommendations
+
+Be specific with measurable improvements and provide code examples."""
+    
     def __init__(self, backend):
         super().__init__(
             name="Performance Expert",
@@ -40,31 +69,4 @@ Always prioritize performance over convenience and provide measurable improvemen
     
     def get_user_prompt(self, user_input: str) -> str:
         """Get the user prompt for performance analysis."""
-        return f"""Please perform a comprehensive performance analysis of this code:
-
-```python
-{user_input}
-```
-
-Provide your performance analysis in the following structure:
-
-- ⚡ **Performance Summary**: Overall performance assessment
-- 🐌 **Bottlenecks Found**: List of performance issues with severity levels
-- 🚀 **Optimization Opportunities**: Specific recommendations for improvement
-- 📊 **OpenStack Performance**: Specific OpenStack performance considerations
-- 🔧 **Code Optimizations**: Specific code changes with examples
-- 📈 **Scalability Notes**: Scalability and resource utilization recommendations
-- 🧪 **Testing Strategy**: Performance testing and benchmarking suggestions
-- 📚 **Additional Resources**: Links to performance tools and documentation
-
-Focus on:
-- Algorithm complexity and efficiency
-- Memory usage and garbage collection
-- Database query optimization
-- I/O operations and network calls
-- Caching strategies
-- OpenStack-specific performance patterns
-- Resource utilization and scalability
-- Profiling and monitoring recommendations
-
-Be specific with measurable improvements and provide code examples."""
+        return self.USER_PROMPT_TEMPLATE.format(user_input=user_input)
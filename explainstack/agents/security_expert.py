@@ -6,6 +6,33 @@ from .base_agent import BaseAgent
 class SecurityExpertAgent(BaseAgent):
     """Agent specialized in security analysis and vulnerability detection."""
     
+    USER_PROMPT_TEMPLATE = """Please perform a comprehensive security analysis of this code:
+
+```python
+{user_input}
+```
+
+Provide your security analysis in the following structure:
+
+- 🔒 **Security Summary**: Overall security assessment
+- ⚠️ **Vulnerabilities Found**: List of security issues with severity levels
+- 🛡️ **Security Best Practices**: Recommendations for improvement
+- 🔐 **OpenStack Security**: Specific OpenStack security considerations
+- 📋 **Compliance Notes**: Regulatory and compliance considerations
+- 🔧 **Remediation Steps**: Specific actions to fix security issues
+- 📚 **Additional Resources**: Links to security documentation and tools
+
+Focus on:
+- Input validation and sanitization
+- Authentication and authorization
+- Data encryption and secure storage
+- Network security and communication
+- Error handling and information disclosure
+- OpenStack-specific security patterns
+- Compliance with security standards
+
+Be thorough but practical in your recommendations."""
+    
     def __init__(self, backend):
         super().__init__(
             name="Security Expert",
@@ -37,29 +64,4 @@ Always prioritize security over convenience and provide actionable recommendatio
     
     def get_user_prompt(self, user_input: str) -> str:
         """Get the user prompt for security analysis."""
-        return f"""Please perform a comprehensive security analysis of this code:
-
-```python
-{user_input}
-```
-
-Provide your security analysis in the following structure:
-
-- 🔒 **Security Summary**: Overall security assessment
-- ⚠️ **Vulnerabilities Found**: List of security issues with severity levels
-- 🛡️ **Security Best Practices**: Recommendations for improvement
-- 🔐 **OpenStack Security**: Specific OpenStack security considerations
-- 📋 **Compliance Notes**: Regulatory and compliance considerations
-- 🔧 **Remediation Steps**: Specific actions to fix security issues
-- 📚 **Additional Resources**: Links to security documentation and tools
-
-Focus on:
-- Input validation and sanitization
-- Authentication and authorization
-- Data encryption and secure storage
-- Network security and communication
-- Error handling and information disclosure
-- OpenStack-specific security patterns
-- Compliance with security standards
-
-Be thorough but practical in your recommendations."""
+        return self.USER_PROMPT_TEMPLATE.format(user_input=user_input)
@@ -1,11 +1,14 @@
 """Analytics manager for ExplainStack."""
 
 import logging
-from typing import Dict, Any, Optional
+from typing import IO, Dict, Any, Optional
 from .metrics_collector import MetricsCollector, UserSession, AgentUsage, SystemMetrics
 
 logger = logging.getLogger(__name__)
 
+AGENTS = ('code_expert', 'patch_reviewer', 'import_cleaner', 'commit_writer', 'security_expert', 'performance_expert')
+AGENT_DISPLAY = {agent_id: agent_id.replace('_', ' ').title() for agent_id in AGENTS}
+
 
 class AnalyticsManager:
     """Manages analytics and metrics for ExplainStack."""
@@ -91,11 +94,7 @@ class AnalyticsManager:
         system_metrics = self.metrics_collector.get_system_metrics(hours)
         
         # Get agent performance for all agents
-        agents = ['code_expert', 'patch_reviewer', 'import_cleaner', 'commit_writer', 'security_expert', 'performance_expert']
-        agent_performance = {}
-        
-        for agent_id in agents:
-            agent_performance[agent_id] = self.metrics_collector.get_agent_performance(agent_id, hours)
+        agent_performance = self.metrics_collector.get_agent_performance_many(AGENTS, hours)
         
         return {
             'system_metrics': system_metrics,
@@ -120,7 +119,7 @@ class AnalyticsManager:
         system_metrics = usage_summary['system_metrics']
         agent_performance = usage_summary['agent_performance']
         
-        report = f"""📊 **ExplainStack Analytics Report** ({hours}h)
+        parts = [f"""📊 **ExplainStack Analytics Report** ({hours}h)
 
 **System Overview:**
 - **Total Users**: {system_metrics['total_users']}
@@ -133,21 +132,21 @@ class AnalyticsManager:
 - **Uptime**: {system_metrics['uptime_hours']:.1f}h
 
 **Agent Performance:**
-"""
+"""]
         
         for agent_id, metrics in agent_performance.items():
             if metrics['total_requests'] > 0:
-                report += f"- **{agent_id.replace('_', ' ').title()}**: {metrics['total_requests']} requests, {metrics['success_rate']:.1f}% success, {metrics['average_response_time']:.2f}s avg\n"
+                parts.append(f"- **{AGENT_DISPLAY[agent_id]}**: {metrics['total_requests']} requests, {metrics['success_rate']:.1f}% success, {metrics['average_response_time']:.2f}s avg\n")
         
         # Top agents
         top_agents = usage_summary['top_agents']
         if top_agents:
-            report += f"\n**Top Agents:**\n"
+            parts.append("\n**Top Agents:**\n")
             for i, (agent_id, metrics) in enumerate(top_agents, 1):
                 if metrics['total_requests'] > 0:
-                    report += f"{i}. **{agent_id.replace('_', ' ').title()}**: {metrics['total_requests']} requests\n"
+                    parts.append(f"{i}. **{AGENT_DISPLAY[agent_id]}**: {metrics['total_requests']} requests\n")
         
-        return report
+        return "".join(parts)
     
     def cleanup_old_data(self, days: int = 30) -> None:
         """Clean up old analytics data.
@@ -158,13 +157,14 @@ class AnalyticsManager:
         self.metrics_collector.cleanup_old_data(days)
         logger.info(f"Cleaned up analytics data older than {days} days")
     
-    def export_analytics(self, format: str = 'json') -> str:
+    def export_analytics(self, format: str = 'json', out: Optional[IO[str]] = None) -> Optional[str]:
         """Export analytics data.
         
         Args:
             format: Export format ('json' or 'csv')
+            out: Optional text stream to write the export to
             
         Returns:
-            Exported data string
+            Exported data string, or None if the data was written to out
         """
-        return self.metrics_collector.export_metrics(format)
+        return self.metrics_collector.export_metrics(format, out)
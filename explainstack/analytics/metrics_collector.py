@@ -1,13 +1,33 @@
 """Metrics collector for ExplainStack analytics."""
 
+import csv
+import io
+import json
 import time
 import logging
-from typing import Dict, Any, List, Optional
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import IO, Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+NS_PER_SECOND = 1_000_000_000
+
+
+def _json_default(obj: Any) -> str:
+    """Serialize values the JSON encoders don't handle natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
 
 @dataclass
 class UserSession:
@@ -16,14 +36,10 @@ class UserSession:
     session_id: str
     start_time: datetime
     end_time: Optional[datetime] = None
-    agent_usage: Dict[str, int] = None
+    agent_usage: Optional[Dict[str, int]] = None  # created on first recorded usage
     total_requests: int = 0
     total_tokens: int = 0
     total_cost: float = 0.0
-    
-    def __post_init__(self):
-        if self.agent_usage is None:
-            self.agent_usage = {}
 
 
 @dataclass
@@ -56,12 +72,77 @@ class SystemMetrics:
 class MetricsCollector:
     """Collects and stores metrics for ExplainStack."""
     
-    def __init__(self):
-        """Initialize metrics collector."""
+    FLUSH_BATCH_SIZE = 1024
+    
+    def __init__(self, max_usage_rows: int = 2 ** 20):
+        """Initialize metrics collector.
+        
+        Args:
+            max_usage_rows: Maximum number of usage rows to keep, the oldest
+                rows are dropped once it is exceeded
+        """
         self.sessions: Dict[str, UserSession] = {}
-        self.agent_usage: List[AgentUsage] = []
+        self.max_usage_rows = max_usage_rows
+        # Agent usage is stored column-wise in typed arrays, one row per request.
+        # Agent and user IDs are interned to small integers.
+        self._ts = array('q')  # wall clock time in nanoseconds
+        self._agent_idx = array('i')
+        self._user_idx = array('i')
+        self._tokens = array('q')
+        self._cost = array('d')
+        self._rt = array('d')
+        self._success = array('b')
+        # Recorded rows not yet written to the columns
+        self._pending: deque = deque()
+        self._agent_ids: Dict[str, int] = {}
+        self._agent_names: List[str] = []
+        self._user_ids: Dict[str, int] = {}
+        self._user_names: List[str] = []
         self.system_metrics: List[SystemMetrics] = []
+        # Open session ID per user, so usage recording doesn't scan every session
+        self._open_session_by_user: Dict[str, str] = {}
+        # Sessions per user, so per-user queries don't scan every session
+        self._sessions_by_user: Dict[str, Dict[str, UserSession]] = {}
+        # (session ID, session) pairs in the order they ended, oldest first
+        self._ended_sessions: deque = deque()
+        # Per-agent sums over all retained rows, so queries covering the whole
+        # history don't need to scan the columns
+        self._retained_totals: Dict[str, List[Any]] = self._new_window_totals()
+        # Running per-user, per-agent usage sums kept in step with the usage rows
+        self._user_agg: Dict[str, Dict[str, Dict[str, Any]]] = {}
         self.start_time = datetime.now()
+        self._start_monotonic_ns = time.monotonic_ns()
+    
+    @property
+    def agent_usage(self) -> List[AgentUsage]:
+        """Agent usage records, built from the usage columns."""
+        self._flush_pending()
+        agent_names = self._agent_names
+        user_names = self._user_names
+        return [
+            AgentUsage(
+                agent_id=agent_names[agent_idx],
+                user_id=user_names[user_idx],
+                timestamp=datetime.fromtimestamp(ts / NS_PER_SECOND),
+                tokens_used=tokens,
+                cost=cost,
+                response_time=rt,
+                success=bool(success)
+            )
+            for ts, agent_idx, user_idx, tokens, cost, rt, success in zip(
+                self._ts, self._agent_idx, self._user_idx, self._tokens,
+                self._cost, self._rt, self._success
+            )
+        ]
+    
+    @staticmethod
+    def _intern(ids: Dict[str, int], names: List[str], name: str) -> int:
+        """Get the integer ID for a name, assigning a new one if needed."""
+        idx = ids.get(name)
+        if idx is None:
+            idx = ids[name] = len(names)
+            names.append(name)
+        return idx
     
     def start_user_session(self, user_id: str, session_id: str) -> None:
         """Start tracking a user session.
@@ -75,7 +156,12 @@ class MetricsCollector:
             session_id=session_id,
             start_time=datetime.now()
         )
+        previous = self.sessions.get(session_id)
+        if previous is not None:
+            self._remove_user_session(previous)
         self.sessions[session_id] = session
+        self._sessions_by_user.setdefault(user_id, {})[session_id] = session
+        self._open_session_by_user[user_id] = session_id
         logger.info(f"Started session for user {user_id}: {session_id}")
     
     def end_user_session(self, session_id: str) -> None:
@@ -85,7 +171,12 @@ class MetricsCollector:
             session_id: Session identifier
         """
         if session_id in self.sessions:
-            self.sessions[session_id].end_time = datetime.now()
+            session = self.sessions[session_id]
+            if session.end_time is None:
+                self._ended_sessions.append((session_id, session))
+            session.end_time = datetime.now()
+            if self._open_session_by_user.get(session.user_id) == session_id:
+                del self._open_session_by_user[session.user_id]
             logger.info(f"Ended session: {session_id}")
     
     def record_agent_usage(self, agent_id: str, user_id: str, tokens_used: int = 0, 
@@ -100,26 +191,21 @@ class MetricsCollector:
             response_time: Response time in seconds
             success: Whether the request was successful
         """
-        usage = AgentUsage(
-            agent_id=agent_id,
-            user_id=user_id,
-            timestamp=datetime.now(),
-            tokens_used=tokens_used,
-            cost=cost,
-            response_time=response_time,
-            success=success
-        )
-        
-        self.agent_usage.append(usage)
+        # Rows are queued and written to the columns in batches
+        self._pending.append((time.time_ns(), agent_id, user_id, tokens_used, cost, response_time, success))
+        if len(self._pending) >= self.FLUSH_BATCH_SIZE:
+            self._flush_pending()
         
         # Update session data
-        for session in self.sessions.values():
-            if session.user_id == user_id and session.end_time is None:
-                session.total_requests += 1
-                session.total_tokens += tokens_used
-                session.total_cost += cost
-                session.agent_usage[agent_id] = session.agent_usage.get(agent_id, 0) + 1
-                break
+        session_id = self._open_session_by_user.get(user_id)
+        session = self.sessions.get(session_id) if session_id else None
+        if session is not None:
+            session.total_requests += 1
+            session.total_tokens += tokens_used
+            session.total_cost += cost
+            if session.agent_usage is None:
+                session.agent_usage = {}
+            session.agent_usage[agent_id] = session.agent_usage.get(agent_id, 0) + 1
         
         logger.debug(f"Recorded agent usage: {agent_id} for user {user_id}")
     
@@ -132,8 +218,8 @@ class MetricsCollector:
         Returns:
             User metrics dictionary
         """
-        user_sessions = [s for s in self.sessions.values() if s.user_id == user_id]
-        user_usage = [u for u in self.agent_usage if u.user_id == user_id]
+        self._flush_pending()
+        user_sessions = list(self._sessions_by_user.get(user_id, {}).values())
         
         total_sessions = len(user_sessions)
         total_requests = sum(s.total_requests for s in user_sessions)
@@ -141,24 +227,15 @@ class MetricsCollector:
         total_cost = sum(s.total_cost for s in user_sessions)
         
         # Agent usage breakdown
-        agent_usage = {}
-        for usage in user_usage:
-            agent_id = usage.agent_id
-            if agent_id not in agent_usage:
-                agent_usage[agent_id] = {
-                    'count': 0,
-                    'tokens': 0,
-                    'cost': 0.0,
-                    'avg_response_time': 0.0
-                }
-            
-            agent_usage[agent_id]['count'] += 1
-            agent_usage[agent_id]['tokens'] += usage.tokens_used
-            agent_usage[agent_id]['cost'] += usage.cost
-            agent_usage[agent_id]['avg_response_time'] = (
-                (agent_usage[agent_id]['avg_response_time'] * (agent_usage[agent_id]['count'] - 1) + 
-                 usage.response_time) / agent_usage[agent_id]['count']
-            )
+        agent_usage = {
+            agent_id: {
+                'count': agg['count'],
+                'tokens': agg['tokens'],
+                'cost': agg['cost'],
+                'avg_response_time': agg['sum_rt'] / agg['count']
+            }
+            for agent_id, agg in self._user_agg.get(user_id, {}).items()
+        }
         
         return {
             'user_id': user_id,
@@ -180,32 +257,32 @@ class MetricsCollector:
         Returns:
             System metrics dictionary
         """
+        self._flush_pending()
         cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff_ts = time.time_ns() - int(hours * 3600 * NS_PER_SECOND)
         
-        # Filter data by time
-        recent_usage = [u for u in self.agent_usage if u.timestamp >= cutoff_time]
         active_sessions = [s for s in self.sessions.values() if s.end_time is None or s.end_time >= cutoff_time]
         
         # Calculate metrics
-        total_requests = len(recent_usage)
-        total_tokens = sum(u.tokens_used for u in recent_usage)
-        total_cost = sum(u.cost for u in recent_usage)
-        error_count = sum(1 for u in recent_usage if not u.success)
+        window = self._reduce_window(cutoff_ts)
+        total_requests = sum(window['requests'])
+        total_tokens = sum(window['tokens'])
+        total_cost = sum(window['cost'])
+        error_count = total_requests - sum(window['successes'])
+        total_response_time = sum(window['response_time'])
         
         # Agent usage breakdown
-        agent_usage = {}
-        for usage in recent_usage:
-            agent_id = usage.agent_id
-            agent_usage[agent_id] = agent_usage.get(agent_id, 0) + 1
+        agent_usage = {
+            self._agent_names[agent_idx]: count
+            for agent_idx, count in enumerate(window['requests']) if count
+        }
         
         # Average response time
-        avg_response_time = (
-            sum(u.response_time for u in recent_usage) / len(recent_usage)
-            if recent_usage else 0.0
-        )
+        avg_response_time = total_response_time / total_requests if total_requests else 0.0
         
         # Unique users
-        unique_users = len(set(u.user_id for u in recent_usage))
+        start = bisect_left(self._ts, cutoff_ts)
+        unique_users = len(self._user_agg) if start == 0 else len(set(self._user_idx[start:]))
         
         return {
             'period_hours': hours,
@@ -218,7 +295,7 @@ class MetricsCollector:
             'error_rate': (error_count / total_requests * 100) if total_requests > 0 else 0.0,
             'average_response_time': avg_response_time,
             'agent_usage': agent_usage,
-            'uptime_hours': (datetime.now() - self.start_time).total_seconds() / 3600
+            'uptime_hours': (time.monotonic_ns() - self._start_monotonic_ns) / NS_PER_SECOND / 3600
         }
     
     def get_agent_performance(self, agent_id: str, hours: int = 24) -> Dict[str, Any]:
@@ -231,36 +308,191 @@ class MetricsCollector:
         Returns:
             Agent performance metrics
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        agent_usage = [u for u in self.agent_usage if u.agent_id == agent_id and u.timestamp >= cutoff_time]
+        return self.get_agent_performance_many([agent_id], hours)[agent_id]
+    
+    def get_agent_performance_many(self, agent_ids: List[str], hours: int = 24) -> Dict[str, Dict[str, Any]]:
+        """Get performance metrics for several agents in a single pass.
+        
+        Args:
+            agent_ids: Agent identifiers
+            hours: Number of hours to look back
+            
+        Returns:
+            Dictionary mapping each agent ID to its performance metrics
+        """
+        self._flush_pending()
+        cutoff_ts = time.time_ns() - int(hours * 3600 * NS_PER_SECOND)
+        
+        window = self._reduce_window(cutoff_ts)
         
-        if not agent_usage:
-            return {
+        performance = {}
+        for agent_id in agent_ids:
+            agent_idx = self._agent_ids.get(agent_id)
+            total_requests = window['requests'][agent_idx] if agent_idx is not None else 0
+            if not total_requests:
+                performance[agent_id] = {
+                    'agent_id': agent_id,
+                    'total_requests': 0,
+                    'success_rate': 0.0,
+                    'average_response_time': 0.0,
+                    'total_tokens': 0,
+                    'total_cost': 0.0
+                }
+                continue
+            
+            performance[agent_id] = {
                 'agent_id': agent_id,
-                'total_requests': 0,
-                'success_rate': 0.0,
-                'average_response_time': 0.0,
-                'total_tokens': 0,
-                'total_cost': 0.0
+                'total_requests': total_requests,
+                'success_rate': window['successes'][agent_idx] / total_requests * 100,
+                'average_response_time': window['response_time'][agent_idx] / total_requests,
+                'total_tokens': window['tokens'][agent_idx],
+                'total_cost': window['cost'][agent_idx],
+                'requests_per_hour': total_requests / hours if hours > 0 else 0
             }
         
-        total_requests = len(agent_usage)
-        successful_requests = sum(1 for u in agent_usage if u.success)
-        success_rate = (successful_requests / total_requests * 100) if total_requests > 0 else 0.0
+        return performance
+    
+    def _flush_pending(self) -> None:
+        """Write queued usage rows to the columns and update the aggregates."""
+        if not self._pending:
+            return
         
-        avg_response_time = sum(u.response_time for u in agent_usage) / total_requests
-        total_tokens = sum(u.tokens_used for u in agent_usage)
-        total_cost = sum(u.cost for u in agent_usage)
+        batch = list(self._pending)
+        self._pending.clear()
         
-        return {
-            'agent_id': agent_id,
-            'total_requests': total_requests,
-            'success_rate': success_rate,
-            'average_response_time': avg_response_time,
-            'total_tokens': total_tokens,
-            'total_cost': total_cost,
-            'requests_per_hour': total_requests / hours if hours > 0 else 0
-        }
+        first_row = len(self._ts)
+        timestamps, agent_ids, user_ids, tokens, costs, response_times, successes = zip(*batch)
+        self._ts.extend(timestamps)
+        self._agent_idx.extend([self._intern(self._agent_ids, self._agent_names, a) for a in agent_ids])
+        self._user_idx.extend([self._intern(self._user_ids, self._user_names, u) for u in user_ids])
+        self._tokens.extend(tokens)
+        self._cost.extend(costs)
+        self._rt.extend(response_times)
+        self._success.extend(successes)
+        for _, agent_id, user_id, tokens_used, cost, response_time, _ in batch:
+            self._update_user_agg(user_id, agent_id, tokens_used, cost, response_time, 1)
+        self._accumulate_rows(self._retained_totals, first_row, len(self._ts))
+        
+        # Trim well below the limit so the oldest rows are dropped in batches
+        if len(self._ts) > self.max_usage_rows:
+            self._drop_oldest_rows(len(self._ts) - (self.max_usage_rows - self.max_usage_rows // 8))
+    
+    def _drop_oldest_rows(self, count: int) -> None:
+        """Drop the oldest usage rows and remove them from the aggregates.
+        
+        Args:
+            count: Number of rows to drop
+        """
+        if count <= 0:
+            return
+        
+        for row in range(count):
+            self._update_user_agg(
+                self._user_names[self._user_idx[row]], self._agent_names[self._agent_idx[row]],
+                self._tokens[row], self._cost[row], self._rt[row], -1
+            )
+        self._accumulate_rows(self._retained_totals, 0, count, -1)
+        for column in (self._ts, self._agent_idx, self._user_idx, self._tokens,
+                       self._cost, self._rt, self._success):
+            del column[:count]
+    
+    def _remove_user_session(self, session: UserSession) -> None:
+        """Remove a session from the per-user session index.
+        
+        Args:
+            session: Session being removed or replaced
+        """
+        user_sessions = self._sessions_by_user.get(session.user_id)
+        if user_sessions is None:
+            return
+        user_sessions.pop(session.session_id, None)
+        if not user_sessions:
+            del self._sessions_by_user[session.user_id]
+    
+    @staticmethod
+    def _new_window_totals() -> Dict[str, List[Any]]:
+        """Create empty per-agent sums."""
+        return {'requests': [], 'successes': [], 'response_time': [], 'tokens': [], 'cost': []}
+    
+    def _accumulate_rows(self, totals: Dict[str, List[Any]], start: int, stop: int, sign: int = 1) -> None:
+        """Add a range of usage rows to, or remove it from, per-agent sums.
+        
+        All per-agent sums are accumulated in one pass over the columns.
+        
+        Args:
+            totals: Per-agent sums, each a list indexed by agent ID
+            start: First row
+            stop: Row after the last one
+            sign: 1 to add the rows, -1 to remove them
+        """
+        requests = totals['requests']
+        successes = totals['successes']
+        response_time = totals['response_time']
+        tokens = totals['tokens']
+        cost = totals['cost']
+        
+        missing = len(self._agent_names) - len(requests)
+        if missing > 0:
+            requests.extend([0] * missing)
+            successes.extend([0] * missing)
+            response_time.extend([0.0] * missing)
+            tokens.extend([0] * missing)
+            cost.extend([0.0] * missing)
+        
+        for agent_idx, row_tokens, row_cost, row_rt, success in zip(
+            self._agent_idx[start:stop], self._tokens[start:stop], self._cost[start:stop],
+            self._rt[start:stop], self._success[start:stop]
+        ):
+            requests[agent_idx] += sign
+            successes[agent_idx] += sign * success
+            response_time[agent_idx] += sign * row_rt
+            tokens[agent_idx] += sign * row_tokens
+            cost[agent_idx] += sign * row_cost
+    
+    def _reduce_window(self, cutoff_ts: int) -> Dict[str, List[Any]]:
+        """Sum usage columns per agent over rows newer than a cutoff.
+        
+        Args:
+            cutoff_ts: Oldest timestamp to include, in nanoseconds
+            
+        Returns:
+            Dictionary of per-agent sums, each a list indexed by agent ID
+        """
+        # Rows are in time order, so the window is the suffix after the cutoff
+        start = bisect_left(self._ts, cutoff_ts)
+        if start == 0:
+            return {name: list(values) for name, values in self._retained_totals.items()}
+        
+        totals = self._new_window_totals()
+        self._accumulate_rows(totals, start, len(self._ts))
+        return totals
+    
+    def _update_user_agg(self, user_id: str, agent_id: str, tokens_used: int, cost: float,
+                         response_time: float, sign: int) -> None:
+        """Add a usage row to, or remove it from, the per-user aggregates.
+        
+        Args:
+            user_id: User identifier
+            agent_id: Agent identifier
+            tokens_used: Number of tokens used
+            cost: Cost of the request
+            response_time: Response time in seconds
+            sign: 1 to add the row, -1 to remove it
+        """
+        user_agg = self._user_agg.setdefault(user_id, {})
+        agg = user_agg.get(agent_id)
+        if agg is None:
+            agg = user_agg[agent_id] = {'count': 0, 'tokens': 0, 'cost': 0.0, 'sum_rt': 0.0}
+        
+        agg['count'] += sign
+        agg['tokens'] += sign * tokens_used
+        agg['cost'] += sign * cost
+        agg['sum_rt'] += sign * response_time
+        
+        if agg['count'] <= 0:
+            del user_agg[agent_id]
+            if not user_agg:
+                del self._user_agg[user_id]
     
     def cleanup_old_data(self, days: int = 30) -> None:
         """Clean up old metrics data.
@@ -268,62 +500,103 @@ class MetricsCollector:
         Args:
             days: Number of days to keep data
         """
+        self._flush_pending()
         cutoff_time = datetime.now() - timedelta(days=days)
         
-        # Remove old agent usage data
-        self.agent_usage = [u for u in self.agent_usage if u.timestamp >= cutoff_time]
+        # Remove old agent usage data. Rows are appended in time order, so the
+        # expired rows are always a prefix of the columns.
+        expired = bisect_left(self._ts, time.time_ns() - int(days * 86400 * NS_PER_SECOND))
+        self._drop_oldest_rows(expired)
         
         # Remove old system metrics
         self.system_metrics = [m for m in self.system_metrics if m.timestamp >= cutoff_time]
         
-        # Remove old sessions
-        old_sessions = [sid for sid, session in self.sessions.items() 
-                       if session.end_time and session.end_time < cutoff_time]
-        for session_id in old_sessions:
+        # Remove old sessions, oldest ended first
+        ended_sessions = self._ended_sessions
+        while ended_sessions:
+            session_id, session = ended_sessions[0]
+            if self.sessions.get(session_id) is not session:
+                # Removed or restarted since it ended; a restarted session is
+                # queued again when it ends
+                ended_sessions.popleft()
+                continue
+            if session.end_time >= cutoff_time:
+                break
+            ended_sessions.popleft()
             del self.sessions[session_id]
+            self._remove_user_session(session)
         
         logger.info(f"Cleaned up data older than {days} days")
     
-    def export_metrics(self, format: str = 'json') -> str:
+    def export_metrics(self, format: str = 'json', out: Optional[IO[str]] = None) -> Optional[str]:
         """Export metrics data.
         
         Args:
             format: Export format ('json' or 'csv')
+            out: Optional text stream to write the export to instead of
+                building it in memory
             
         Returns:
-            Exported data string
+            Exported data string, or None if the data was written to out
         """
+        self._flush_pending()
+        if format not in ('json', 'csv'):
+            raise ValueError(f"Unsupported format: {format}")
+        
+        output = io.StringIO() if out is None else out
+        
         if format == 'json':
-            import json
+            agent_names = self._agent_names
+            user_names = self._user_names
             data = {
-                'sessions': [asdict(s) for s in self.sessions.values()],
-                'agent_usage': [asdict(u) for u in self.agent_usage],
+                # Sessions without usage export an empty mapping, not null
+                'sessions': [
+                    {**asdict(s), 'agent_usage': s.agent_usage or {}}
+                    for s in self.sessions.values()
+                ],
+                'agent_usage': [
+                    {
+                        'agent_id': agent_names[agent_idx],
+                        'user_id': user_names[user_idx],
+                        'timestamp': datetime.fromtimestamp(ts / NS_PER_SECOND),
+                        'request_count': 1,
+                        'tokens_used': tokens,
+                        'cost': cost,
+                        'response_time': rt,
+                        'success': bool(success)
+                    }
+                    for ts, agent_idx, user_idx, tokens, cost, rt, success in zip(
+                        self._ts, self._agent_idx, self._user_idx, self._tokens,
+                        self._cost, self._rt, self._success
+                    )
+                ],
                 'system_metrics': [asdict(m) for m in self.system_metrics]
             }
-            return json.dumps(data, default=str, indent=2)
+            if orjson is not None:
+                output.write(orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2).decode())
+            else:
+                json.dump(data, output, default=_json_default, indent=2)
         
-        elif format == 'csv':
-            import csv
-            import io
-            
-            output = io.StringIO()
-            
-            # Export agent usage
-            if self.agent_usage:
-                writer = csv.writer(output)
-                writer.writerow(['timestamp', 'agent_id', 'user_id', 'tokens_used', 'cost', 'response_time', 'success'])
-                for usage in self.agent_usage:
-                    writer.writerow([
-                        usage.timestamp.isoformat(),
-                        usage.agent_id,
-                        usage.user_id,
-                        usage.tokens_used,
-                        usage.cost,
-                        usage.response_time,
-                        usage.success
-                    ])
-            
-            return output.getvalue()
+        elif self._ts:
+            # Export agent usage straight from the columns
+            agent_names = self._agent_names
+            user_names = self._user_names
+            writer = csv.writer(output)
+            writer.writerow(['timestamp', 'agent_id', 'user_id', 'tokens_used', 'cost', 'response_time', 'success'])
+            writer.writerows(
+                (
+                    datetime.fromtimestamp(ts / NS_PER_SECOND).isoformat(),
+                    agent_names[agent_idx],
+                    user_names[user_idx],
+                    tokens,
+                    cost,
+                    rt,
+                    bool(success)
+                )
+                for ts, agent_idx, user_idx, tokens, cost, rt, success in zip(
+                    self._ts, self._agent_idx, self._user_idx, self._tokens,
+                    self._cost, self._rt, self._success
+                )
+            )
         
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+        return output.getvalue() if out is None else None
@@ -1,9 +1,13 @@
 """ExplainStack Multi-Agent Application with Optional Authentication."""
 
 import os
+import re
 import time
+import asyncio
 import logging
-from typing import Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import chainlit as cl
 import openai
@@ -18,18 +22,35 @@ from explainstack.ui import AgentSelector, APIConfigUI
 from explainstack.ui.gerrit_config import GerritConfigUI
 from explainstack.database import DatabaseManager
 from explainstack.auth import AuthService, AuthMiddleware
+from explainstack.auth.auth_service import EMAIL_PATTERN, MIN_PASSWORD_LENGTH
 from explainstack.user import UserService, UserPreferencesManager
 from explainstack.utils import FileHandler
 from explainstack.integrations import GerritIntegration
 from explainstack.analytics import AnalyticsManager
 
-# Configuration - using environment variables for API keys
+@lru_cache(maxsize=1)
+def load_env_once() -> None:
+    """Load the .env file at most once per process.
+    
+    Variables already set in the environment are left untouched.
+    """
+    load_dotenv()
+
+# Configuration - using environment variables for API keys, read once and
+# shared by every backend of the same provider. The .env file is only parsed
+# when one of the keys is not already in the environment.
+PROVIDER_KEY_NAMES = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY")
+if not all(key_name in os.environ for key_name in PROVIDER_KEY_NAMES):
+    load_env_once()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "demo-key")
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "demo-key")
+
 config_data = {
     "backends": {
         "code_expert": {
             "type": "openai",
             "config": {
-                "api_key": os.getenv("OPENAI_API_KEY", "demo-key"),
+                "api_key": OPENAI_API_KEY,
                 "model": "gpt-4",
                 "temperature": 0.3,
                 "max_tokens": 2000
@@ -38,7 +59,7 @@ config_data = {
         "patch_reviewer": {
             "type": "claude",
             "config": {
-                "api_key": os.getenv("ANTHROPIC_API_KEY", "demo-key"),
+                "api_key": ANTHROPIC_API_KEY,
                 "model": "claude-3-sonnet-20240229",
                 "temperature": 0.2,
                 "max_tokens": 3000
@@ -47,7 +68,7 @@ config_data = {
         "import_cleaner": {
             "type": "openai",
             "config": {
-                "api_key": os.getenv("OPENAI_API_KEY", "demo-key"),
+                "api_key": OPENAI_API_KEY,
                 "model": "gpt-3.5-turbo",
                 "temperature": 0.1,
                 "max_tokens": 1000
@@ -56,7 +77,7 @@ config_data = {
         "commit_writer": {
             "type": "openai",
             "config": {
-                "api_key": os.getenv("OPENAI_API_KEY", "demo-key"),
+                "api_key": OPENAI_API_KEY,
                 "model": "gpt-4",
                 "temperature": 0.3,
                 "max_tokens": 1500
@@ -65,7 +86,7 @@ config_data = {
         "security_expert": {
             "type": "claude",
             "config": {
-                "api_key": os.getenv("ANTHROPIC_API_KEY", "demo-key"),
+                "api_key": ANTHROPIC_API_KEY,
                 "model": "claude-3-sonnet-20240229",
                 "temperature": 0.1,
                 "max_tokens": 3000
@@ -74,7 +95,7 @@ config_data = {
         "performance_expert": {
             "type": "openai",
             "config": {
-                "api_key": os.getenv("OPENAI_API_KEY", "demo-key"),
+                "api_key": OPENAI_API_KEY,
                 "model": "gpt-4",
                 "temperature": 0.2,
                 "max_tokens": 2500
@@ -91,11 +112,11 @@ config_data = {
     }
 }
 
-# Logging configuration
-logging.basicConfig(
-    level=getattr(logging, config_data["logging"]["level"]),
-    format=config_data["logging"]["format"]
-)
+# Logging configuration, left alone when the host (tests, Chainlit reloads)
+# has already configured the root logger
+LOG_LEVEL = getattr(logging, config_data["logging"]["level"].upper(), logging.INFO)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=LOG_LEVEL, format=config_data["logging"]["format"])
 logger = logging.getLogger(__name__)
 
 # OpenAI API configuration with error handling
@@ -103,7 +124,7 @@ def setup_openai():
     """Configure OpenAI API with error handling."""
     try:
         if "OPENAI_API_KEY" not in os.environ:
-            load_dotenv()
+            load_env_once()
 
         api_key = os.getenv("OPENAI_API_KEY", None)
         if not api_key or api_key == "demo-key":
@@ -139,57 +160,34 @@ file_handler = FileHandler()
 # Gerrit integration will be initialized dynamically with user config
 analytics_manager = AnalyticsManager()
 
+# Agent routers for authenticated users, keyed by user email. Entries are
+# evicted when the user changes their API keys.
+USER_ROUTER_CACHE_SIZE = 256
+user_agent_routers: "OrderedDict[str, AgentRouter]" = OrderedDict()
+
+MIN_INPUT_LENGTH = int(config_data["validation"]["min_input_length"])
+MAX_INPUT_LENGTH = int(config_data["validation"]["max_input_length"])
+
+# Credential checks for the login and register prompts
+PASSWORD_LETTER_PATTERN = re.compile(r'[A-Za-z]')
+PASSWORD_DIGIT_PATTERN = re.compile(r'[0-9]')
+
 def validate_input(user_text: str) -> tuple[bool, Optional[str]]:
     """Validate user input."""
-    if not user_text or not user_text.strip():
-        return False, "Message cannot be empty"
-    
-    min_length = config_data["validation"]["min_input_length"]
-    max_length = config_data["validation"]["max_input_length"]
-    
-    if len(user_text) < min_length:
-        return False, f"Message is too short (min {min_length} characters)"
+    length = len(user_text)
+    if MIN_INPUT_LENGTH <= length <= MAX_INPUT_LENGTH and not user_text.isspace():
+        return True, None
     
-    if len(user_text) > max_length:
-        return False, f"Message is too long (max {max_length} characters)"
+    # isspace() is False for "" so both checks are needed; neither copies the text
+    if length == 0 or user_text.isspace():
+        return False, "Message cannot be empty"
     
-    return True, None
-
-@cl.on_chat_start
-async def start():
-    """Initialize the chat session."""
-    # Check if user is authenticated
-    session_id = cl.user_session.get("session_id")
-    current_user = auth_middleware.get_current_user(session_id)
+    if length < MIN_INPUT_LENGTH:
+        return False, f"Message is too short (min {MIN_INPUT_LENGTH} characters)"
     
-    if current_user:
-        # User is authenticated
-        user_info = auth_middleware.get_user_info(current_user)
-        welcome_message = f"""🤖 **Welcome back to ExplainStack, {current_user.email}!**
+    return False, f"Message is too long (max {MAX_INPUT_LENGTH} characters)"
 
-I'm your AI assistant specialized in OpenStack development. You're logged in with your personal configuration.
-
-**Your Profile:**
-- 📧 Email: {current_user.email}
-- 🎯 Default Agent: {preferences_manager.get_default_agent(current_user.user_id)}
-- 🎨 Theme: {preferences_manager.get_theme(current_user.user_id)}
-
-**Available Agents:**
-- 🧠 **Code Expert**: Explains Python code and OpenStack patterns
-- 🔍 **Patch Reviewer**: Reviews Gerrit patches and suggests improvements  
-- 🧹 **Import Cleaner**: Organizes imports according to OpenStack standards
-- 💬 **Commit Writer**: Generates professional commit messages
-
-**Quick Commands:**
-- Type `profile` to view your settings
-- Type `api` to configure your API keys
-- Type `logout` to sign out
-- Send your code/patch for analysis
-
-Ready to help! What would you like to work on?"""
-    else:
-        # User is not authenticated
-        welcome_message = """🤖 **Welcome to ExplainStack Multi-Agent System!**
+ANONYMOUS_WELCOME_MESSAGE = """🤖 **Welcome to ExplainStack Multi-Agent System!**
 
 I'm your AI assistant specialized in OpenStack development. You can use me with or without an account.
 
@@ -220,31 +218,121 @@ I'm your AI assistant specialized in OpenStack development. You can use me with
 - Personal preferences and session history
 
 Ready to help! What would you like to work on?"""
+
+@lru_cache(maxsize=1024)
+def build_welcome_message(email: str, default_agent: str, theme: str) -> str:
+    """Build the welcome message for an authenticated user."""
+    return f"""🤖 **Welcome back to ExplainStack, {email}!**
+
+I'm your AI assistant specialized in OpenStack development. You're logged in with your personal configuration.
+
+**Your Profile:**
+- 📧 Email: {email}
+- 🎯 Default Agent: {default_agent}
+- 🎨 Theme: {theme}
+
+**Available Agents:**
+- 🧠 **Code Expert**: Explains Python code and OpenStack patterns
+- 🔍 **Patch Reviewer**: Reviews Gerrit patches and suggests improvements  
+- 🧹 **Import Cleaner**: Organizes imports according to OpenStack standards
+- 💬 **Commit Writer**: Generates professional commit messages
+
+**Quick Commands:**
+- Type `profile` to view your settings
+- Type `api` to configure your API keys
+- Type `logout` to sign out
+- Send your code/patch for analysis
+
+Ready to help! What would you like to work on?"""
+
+@cl.on_chat_start
+async def start():
+    """Initialize the chat session."""
+    # Check if user is authenticated
+    session_id = cl.user_session.get("session_id")
+    current_user = auth_middleware.get_current_user(session_id)
+    
+    if current_user:
+        # User is authenticated
+        welcome_message = build_welcome_message(
+            current_user.email,
+            preferences_manager.get_default_agent(current_user.user_id),
+            preferences_manager.get_theme(current_user.user_id)
+        )
+    else:
+        # User is not authenticated
+        welcome_message = ANONYMOUS_WELCOME_MESSAGE
     
     await cl.Message(content=welcome_message).send()
 
+async def process_uploaded_file(content: bytes, name: str) -> Tuple[bool, Optional[dict], Optional[str]]:
+    """Save an uploaded file and prepare it for analysis.
+    
+    Args:
+        content: Uploaded file content
+        name: Uploaded file name
+        
+    Returns:
+        Tuple of (success, file_info, error_message)
+    """
+    # File handling is blocking I/O, keep it off the event loop
+    success, file_path, error_msg = await asyncio.to_thread(
+        file_handler.save_uploaded_file, content, name
+    )
+    if not success:
+        return False, None, f"❌ Error uploading file: {error_msg}"
+    
+    # Only the preview is read now, the full content is loaded on demand
+    success, file_info, error_msg = await asyncio.to_thread(
+        file_handler.peek_file_for_preview, file_path
+    )
+    if not success:
+        return False, None, f"❌ Error processing file: {error_msg}"
+    
+    return True, file_info, None
+
+FILE_ACTIONS_TEXT = """**What would you like to do with this file?**
+- Type `explain` to analyze the code
+- Type `security` to check for vulnerabilities  
+- Type `review` to review the code
+- Type `clean imports` to organize imports
+- Type `commit message` to generate a commit message
+
+Or just ask me anything about this code!"""
+
 async def handle_file_upload(elements):
     """Handle uploaded files."""
     try:
+        # Skip elements that carry no file content
+        files = []
         for element in elements:
-            if hasattr(element, 'content') and hasattr(element, 'name'):
-                # Save uploaded file
-                success, file_path, error_msg = file_handler.save_uploaded_file(
-                    element.content, element.name
-                )
-                
-                if not success:
-                    await cl.Message(content=f"❌ Error uploading file: {error_msg}").send()
-                    continue
-                
-                # Process file for analysis
-                success, file_info, error_msg = file_handler.process_file_for_analysis(file_path)
-                if not success:
-                    await cl.Message(content=f"❌ Error processing file: {error_msg}").send()
-                    continue
-                
-                # Display file info
-                file_info_msg = f"""📁 **File Uploaded Successfully!**
+            try:
+                files.append((element.content, element.name))
+            except AttributeError:
+                continue
+        
+        # Process all files concurrently, then report results in upload order
+        results = await asyncio.gather(
+            *(process_uploaded_file(content, name) for content, name in files),
+            return_exceptions=True
+        )
+        
+        # Report every file in one message instead of one per file
+        blocks = []
+        uploaded = False
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error handling file upload: {result}")
+                blocks.append("❌ Error processing uploaded file. Please try again.")
+                continue
+            
+            success, file_info, error_msg = result
+            if not success:
+                blocks.append(error_msg)
+                continue
+            
+            # Display file info
+            blocks.append(f"""📁 **File Uploaded Successfully!**
 
 **File:** {file_info['filename']}
 **Size:** {file_info['size']} bytes
@@ -253,24 +341,19 @@ async def handle_file_upload(elements):
 
 **Content Preview:**
 ```python
-{file_info['content'][:500]}{'...' if len(file_info['content']) > 500 else ''}
-```
-
-**What would you like to do with this file?**
-- Type `explain` to analyze the code
-- Type `security` to check for vulnerabilities  
-- Type `review` to review the code
-- Type `clean imports` to organize imports
-- Type `commit message` to generate a commit message
-
-Or just ask me anything about this code!"""
-                
-                await cl.Message(content=file_info_msg).send()
-                
-                # Store file content in session for further analysis
-                cl.user_session.set("uploaded_file", file_info)
-                logger.info(f"File uploaded and processed: {file_info['filename']}")
-                
+{file_info['preview']}{'...' if file_info['truncated'] else ''}
+```""")
+            
+            # Store file content in session for further analysis
+            cl.user_session.set("uploaded_file", file_info)
+            uploaded = True
+            logger.info("File uploaded and processed: %s", file_info['filename'])
+        
+        if uploaded:
+            blocks.append(FILE_ACTIONS_TEXT)
+        if blocks:
+            await cl.Message(content="\n\n---\n\n".join(blocks)).send()
+            
     except Exception as e:
         logger.error(f"Error handling file upload: {e}")
         await cl.Message(content="❌ Error processing uploaded file. Please try again.").send()
@@ -284,8 +367,10 @@ async def handle_gerrit_url(url: str):
         # Get configured Gerrit integration
         configured_gerrit = gerrit_config_ui.get_gerrit_integration()
         
-        # Analyze Gerrit URL
-        success, analysis_result, error_msg = configured_gerrit.analyze_gerrit_url(url)
+        # Analyze Gerrit URL, the HTTP requests are blocking so run them in a thread
+        success, analysis_result, error_msg = await asyncio.to_thread(
+            configured_gerrit.analyze_gerrit_url, url
+        )
         
         if not success:
             # Check if it's an authentication error
@@ -310,7 +395,7 @@ async def handle_gerrit_url(url: str):
         
         # Store Gerrit data in session for further analysis
         cl.user_session.set("gerrit_analysis", analysis_result)
-        logger.info(f"Gerrit URL analyzed successfully: {url}")
+        logger.info("Gerrit URL analyzed successfully: %s", url)
         
     except Exception as e:
         logger.error(f"Error handling Gerrit URL {url}: {e}")
@@ -327,14 +412,11 @@ async def handle_analytics():
             await cl.Message(content="❌ **Analytics Dashboard**\n\nPlease log in to view analytics.").send()
             return
         
-        # Get analytics data
-        dashboard_data = analytics_manager.get_dashboard_data(current_user.id, hours=24)
-        
         # Generate analytics report
         report = analytics_manager.generate_analytics_report(hours=24)
         
         await cl.Message(content=report).send()
-        logger.info(f"Analytics dashboard displayed for user {current_user.id}")
+        logger.info("Analytics dashboard displayed for user %s", current_user.id)
         
     except Exception as e:
         logger.error(f"Error handling analytics request: {e}")
@@ -344,13 +426,12 @@ async def handle_gerrit_config():
     """Handle Gerrit configuration."""
     try:
         # Check if user is logged in
-        user_logged_in = cl.user_session.get("user_logged_in", False)
-        user_email = cl.user_session.get("user_email", "")
+        user_email = get_logged_in_email()
         
-        if user_logged_in and user_email:
+        if user_email:
             # Get the real user object from database
             try:
-                real_user = auth_service.db.get_user_by_email(user_email)
+                real_user = await get_session_user(user_email)
                 if real_user:
                     await gerrit_config_ui.show_config_ui(real_user)
                 else:
@@ -375,28 +456,40 @@ async def main(message: cl.Message):
             return
         
         user_text = message.content
-        logger.info(f"Received message: {user_text[:100]}...")
+        logger.info("Received message: %.100s...", user_text)
+        
+        # Normalize once; long messages can't be commands so skip lowercasing them
+        stripped_text = user_text.strip()
+        command = stripped_text.casefold() if len(stripped_text) <= MAX_COMMAND_LENGTH else ""
         
         # Check if user has uploaded a file and wants to analyze it
         uploaded_file = cl.user_session.get("uploaded_file")
-        if uploaded_file and user_text.lower().strip() in ["explain", "security", "review", "clean imports", "commit message"]:
+        if uploaded_file and command in UPLOADED_FILE_COMMANDS:
             # Use uploaded file content for analysis
-            user_text = f"{user_text}\n\n```python\n{uploaded_file['content']}\n```"
+            success, file_content, error_msg = await asyncio.to_thread(
+                file_handler.read_file_content, uploaded_file['path']
+            )
+            if not success:
+                await cl.Message(content=f"❌ Error reading uploaded file: {error_msg}").send()
+                return
+            user_text = f"{user_text}\n\n```python\n{file_content}\n```"
             logger.info("Using uploaded file content for analysis")
         
         # Check if user has Gerrit analysis and wants to analyze it
         gerrit_analysis = cl.user_session.get("gerrit_analysis")
-        if gerrit_analysis and user_text.lower().strip() in ["review", "security", "performance", "commit message"]:
+        if gerrit_analysis and command in GERRIT_ANALYSIS_COMMANDS:
             # Use Gerrit diff content for analysis
             diff_content = gerrit_analysis.get('diff_content', '')
             if diff_content:
                 user_text = f"{user_text}\n\n```diff\n{diff_content}\n```"
                 logger.info("Using Gerrit diff content for analysis")
         
-        # Check if user provided a Gerrit URL
-        gerrit_integration = get_gerrit_integration()
-        if gerrit_integration.is_gerrit_url(user_text.strip()):
-            await handle_gerrit_url(user_text.strip())
+        # Check if user provided a Gerrit URL; every Gerrit URL pattern is
+        # anchored on the scheme, so code pastes skip the regex checks. Text
+        # extended with an upload or diff above starts with a command, never a URL.
+        if (stripped_text.startswith(GERRIT_URL_PREFIXES)
+                and GerritIntegration.is_gerrit_url(stripped_text)):
+            await handle_gerrit_url(stripped_text)
             return
         
         # Input validation
@@ -406,34 +499,11 @@ async def main(message: cl.Message):
             return
         
         # Check for authentication commands first
-        logger.info(f"Checking command for: '{user_text.lower().strip()}'")
-        if user_text.lower().strip() in ["login", "signin"]:
-            logger.info("Detected login command")
-            await handle_login()
-            return
-        elif user_text.lower().strip() in ["register", "signup"]:
-            logger.info("Detected register command")
-            await handle_register()
-            return
-        elif user_text.lower().strip() in ["logout", "signout"]:
-            logger.info("Detected logout command")
-            await handle_logout()
-            return
-        elif user_text.lower().strip() in ["profile", "settings"]:
-            logger.info("Detected profile command")
-            await handle_profile()
-            return
-        elif user_text.lower().strip() in ["api", "keys", "config", "set openai", "set claude", "set anthropic", "configure openai", "configure claude"]:
-            logger.info("Detected api command")
-            await handle_api_config()
-            return
-        elif user_text.lower().strip() in ["analytics", "metrics", "stats"]:
-            logger.info("Detected analytics command")
-            await handle_analytics()
-            return
-        elif user_text.lower().strip() in ["gerrit", "gerrit config", "gerrit settings"]:
-            logger.info("Detected gerrit command")
-            await handle_gerrit_config()
+        logger.info("Checking command for: '%s'", command)
+        handler = COMMAND_HANDLERS.get(command)
+        if handler:
+            logger.info("Detected %s command", command)
+            await handler()
             return
         
         # Get current user and configuration
@@ -441,16 +511,17 @@ async def main(message: cl.Message):
         current_user = auth_middleware.get_current_user(session_id)
         
         # Check for API configuration commands FIRST (only for authenticated users)
-        user_logged_in = cl.user_session.get("user_logged_in", False)
-        user_email = cl.user_session.get("user_email", "")
+        user_email = get_logged_in_email()
         
-        if user_logged_in and user_email and user_text.lower().startswith(("set ", "test ", "clear ")):
+        if user_email and user_text[:API_COMMAND_PREFIX_LENGTH].casefold().startswith(API_COMMAND_PREFIXES):
             # Get the real user object from database
             try:
-                real_user = auth_service.db.get_user_by_email(user_email)
+                real_user = await get_session_user(user_email)
                 if real_user:
                     handled = await api_config_ui.handle_api_command(real_user, user_text)
                     if handled:
+                        # Rebuild the user's agents with their new keys on the next message
+                        user_agent_routers.pop(user_email, None)
                         return
                 else:
                     await cl.Message(content="❌ User not found in database. Please login again.").send()
@@ -465,10 +536,10 @@ async def main(message: cl.Message):
             return
         
         # Check for Gerrit configuration responses (after command detection)
-        if user_logged_in and user_email:
+        if user_email:
             # Get the real user object for Gerrit config
             try:
-                real_user = auth_service.db.get_user_by_email(user_email)
+                real_user = await get_session_user(user_email)
                 if real_user and await gerrit_config_ui.handle_gerrit_input(user_text, real_user):
                     return
             except Exception as e:
@@ -477,78 +548,91 @@ async def main(message: cl.Message):
             return
         
         # Use user-specific configuration if authenticated, otherwise use default
-        if user_logged_in and user_email:
-            # Create dynamic config with user's API keys from database
-            dynamic_config = create_dynamic_config(config_data, user_email)
-            agent_config = AgentConfig(dynamic_config)
-        else:
-            # Use default configuration for non-authenticated users
-            agent_config = AgentConfig(config_data)
-        
-        # Create agent router with the appropriate configuration
-        agent_router = AgentRouter(agent_config)
+        agent_router = await get_agent_router(user_email)
         
         # Check for agent selection commands
         selected_agent_id = agent_selector.parse_agent_selection(user_text)
         
         if selected_agent_id is None:
             # User cancelled or invalid selection
-            if user_text.lower().strip() in ["cancel", "c"]:
+            if command in CANCEL_COMMANDS:
                 await cl.Message(content="❌ Operation cancelled.").send()
                 return
             # Continue with normal processing
         
+        # Add agent info to response
+        response_header = ""
+        if selected_agent_id:
+            agent_info = agent_router.get_available_agents().get(selected_agent_id)
+            if agent_info:
+                response_header = f"🤖 **{agent_info['name']}**\n\n"
+        
+        # Stream the response as it is generated when the backend supports it
+        response_message = cl.Message(content=response_header)
+        streamed = False
+        
+        async def stream_token(token: str) -> None:
+            nonlocal streamed
+            streamed = True
+            await response_message.stream_token(token)
+        
+        # Resolve the agent once; the router and analytics share the result
+        agent_id = selected_agent_id or agent_router.get_auto_suggestion(user_text)
+        
         # Route to appropriate agent
-        start_time = time.time()
+        start_time = time.perf_counter()
+        usage = {}
         success, response, error_msg = await agent_router.route_request(
             user_text, 
-            selected_agent_id
+            agent_id,
+            on_token=stream_token,
+            usage=usage
         )
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time
         
-        # Track analytics
-        session_id = cl.user_session.get("session_id")
-        current_user = auth_middleware.get_current_user(session_id)
+        # Track analytics, reusing the user looked up for this message
         user_id = current_user.id if current_user else "anonymous"
         
         # Track agent usage
-        agent_id = selected_agent_id or agent_router.get_auto_suggestion(user_text)
         analytics_manager.track_agent_usage(
             agent_id=agent_id,
             user_id=user_id,
-            tokens_used=len(user_text) + len(response) if response else 0,
+            tokens_used=usage.get("total_tokens", 0),
             cost=0.0,  # TODO: Calculate actual cost
             response_time=response_time,
             success=success
         )
         
         if success and response:
-            # Add agent info to response
-            if selected_agent_id:
-                agent_info = agent_router.get_available_agents().get(selected_agent_id)
-                if agent_info:
-                    response = f"🤖 **{agent_info['name']}**\n\n{response}"
-            
-            await cl.Message(content=response).send()
+            if not streamed:
+                response_message.content = f"{response_header}{response}"
+            await response_message.send()
             logger.info("Response sent successfully")
         else:
+            if streamed:
+                await response_message.send()
             error_content = f"❌ {error_msg}"
             await cl.Message(content=error_content).send()
-            logger.error(f"Failed to get response: {error_msg}")
+            logger.error("Failed to get response: %s", error_msg)
             
     except Exception as e:
-        logger.critical(f"Unexpected error in main: {e}")
+        logger.critical("Unexpected error in main: %s", e)
         await cl.Message(content="❌ An unexpected error occurred. Please try again.").send()
 
-async def handle_login():
-    """Handle user login."""
-    # Check if user is already logged in
-    user_logged_in = cl.user_session.get("user_logged_in", False)
-    user_email = cl.user_session.get("user_email", "")
-    
-    if user_logged_in and user_email:
-        # User is already logged in
-        await cl.Message(content=f"""✅ **Already Logged In**
+LOGIN_PROMPT = """🔐 **Login to ExplainStack**
+
+Please provide your credentials:
+- Email: [Your email address]
+- Password: [Your password]
+
+Type your email and password separated by a space, or type 'cancel' to go back.
+
+Example: `user@example.com mypassword`"""
+
+@lru_cache(maxsize=1024)
+def build_login_options_text(user_email: str) -> str:
+    """Build the options shown to a user who is already logged in."""
+    return f"""✅ **Already Logged In**
 
 You are currently logged in as: **{user_email}**
 
@@ -558,7 +642,16 @@ You are currently logged in as: **{user_email}**
 3. **Logout** - Sign out and login with different account
 4. **Switch account** - Login with different credentials
 
-Type the number of your choice (1-4), or type 'cancel' to go back.""").send()
+Type the number of your choice (1-4), or type 'cancel' to go back."""
+
+async def handle_login():
+    """Handle user login."""
+    # Check if user is already logged in
+    user_email = get_logged_in_email()
+    
+    if user_email:
+        # User is already logged in
+        await cl.Message(content=build_login_options_text(user_email)).send()
         
         # Set auth state to handle login options
         cl.user_session.set("auth_state", "login_options")
@@ -567,36 +660,73 @@ Type the number of your choice (1-4), or type 'cancel' to go back.""").send()
     # User is not logged in, proceed with normal login
     cl.user_session.set("auth_state", "login")
     
-    await cl.Message(content="""🔐 **Login to ExplainStack**
-
-Please provide your credentials:
-- Email: [Your email address]
-- Password: [Your password]
-
-Type your email and password separated by a space, or type 'cancel' to go back.
+    await cl.Message(content=LOGIN_PROMPT).send()
 
-Example: `user@example.com mypassword`""").send()
+async def get_agent_router(user_email: Optional[str] = None) -> AgentRouter:
+    """Get the agent router for a user.
+    
+    Routers are reused until the user changes their API keys, so neither the
+    database lookup of their keys nor the agents and their backend clients
+    are rebuilt per message. On a miss the user's keys are loaded from the
+    database in a worker thread.
+    
+    Args:
+        user_email: Authenticated user's email, or None for the default configuration
+        
+    Returns:
+        Agent router for the user
+    """
+    if not user_email:
+        return agent_router
+    
+    router = user_agent_routers.get(user_email)
+    if router is None:
+        # Create dynamic config with user's API keys from database
+        dynamic_config = await asyncio.to_thread(create_dynamic_config, config_data, user_email)
+        router = AgentRouter(AgentConfig(dynamic_config))
+        user_agent_routers[user_email] = router
+        while len(user_agent_routers) > USER_ROUTER_CACHE_SIZE:
+            user_agent_routers.popitem(last=False)
+    else:
+        user_agent_routers.move_to_end(user_email)
+    
+    return router
 
-def get_gerrit_integration() -> GerritIntegration:
-    """Get Gerrit integration with user configuration.
+def get_logged_in_email() -> str:
+    """Get the email of the logged in user.
     
     Returns:
-        Configured GerritIntegration instance
+        User email, or an empty string when nobody is logged in
     """
-    # Get Gerrit configuration from session
-    gerrit_config = cl.user_session.get("gerrit_config", {})
+    if cl.user_session.get("user_logged_in", False):
+        return cl.user_session.get("user_email", "")
+    return ""
+
+async def get_session_user(user_email: str):
+    """Get the database user for the logged in email.
     
-    base_url = gerrit_config.get("base_url", "https://review.opendev.org")
-    username = gerrit_config.get("username", "")
-    password = gerrit_config.get("password", "")
-    api_token = gerrit_config.get("api_token", "")
+    The user is kept on the Chainlit session after the first lookup, so
+    handlers don't query the database for it on every message. The lookup
+    itself runs in a worker thread to keep the event loop free.
     
-    return GerritIntegration(
-        base_url=base_url,
-        username=username,
-        password=password,
-        api_token=api_token
-    )
+    Args:
+        user_email: Logged in user's email
+        
+    Returns:
+        User instance or None if not found
+    """
+    user = cl.user_session.get("session_user")
+    if user is None or user.email != user_email:
+        user = await asyncio.to_thread(auth_service.get_user_by_email, user_email)
+        cl.user_session.set("session_user", user)
+    return user
+
+# User API key preference names by backend type
+USER_API_KEY_NAMES = {
+    "openai": "openai_api_key",
+    "claude": "claude_api_key",
+    "gemini": "gemini_api_key"
+}
 
 def create_dynamic_config(base_config: dict, user_email: str = None) -> dict:
     """Create dynamic configuration using user's API keys from database.
@@ -617,30 +747,33 @@ def create_dynamic_config(base_config: dict, user_email: str = None) -> dict:
     
     try:
         # Get user from database
-        user = auth_service.db.get_user_by_email(user_email)
+        user = auth_service.get_user_by_email(user_email)
         if not user:
             return dynamic_config
         
         # Get user's API keys from database
         user_keys = user_service.get_user_api_keys(user)
         
-        # Update OpenAI backends with user's key if available
-        if user_keys.get("openai_api_key"):
-            for agent_name, agent_config in dynamic_config["backends"].items():
-                if agent_config["type"] == "openai":
-                    agent_config["config"]["api_key"] = user_keys["openai_api_key"]
-        
-        # Update Claude backends with user's key if available
-        if user_keys.get("claude_api_key"):
-            for agent_name, agent_config in dynamic_config["backends"].items():
-                if agent_config["type"] == "claude":
-                    agent_config["config"]["api_key"] = user_keys["claude_api_key"]
+        # Map backend types to the user's keys, skipping unset ones
+        keys_by_type = {
+            backend_type: user_keys[key_name]
+            for backend_type, key_name in USER_API_KEY_NAMES.items()
+            if user_keys.get(key_name)
+        }
+        if not keys_by_type:
+            return dynamic_config
         
-        # Update Gemini backends with user's key if available
-        if user_keys.get("gemini_api_key"):
-            for agent_name, agent_config in dynamic_config["backends"].items():
-                if agent_config["type"] == "gemini":
-                    agent_config["config"]["api_key"] = user_keys["gemini_api_key"]
+        # Copy only the backend entries that change, the base config is shared
+        dynamic_config["backends"] = {
+            agent_name: (
+                {
+                    **agent_config,
+                    "config": {**agent_config["config"], "api_key": keys_by_type[agent_config["type"]]}
+                }
+                if agent_config["type"] in keys_by_type else agent_config
+            )
+            for agent_name, agent_config in base_config["backends"].items()
+        }
         
     except Exception as e:
         logger.error(f"Failed to load user API keys: {e}")
@@ -668,35 +801,35 @@ async def handle_auth_responses(user_text: str) -> bool:
                 return True
             
             # Process registration (email and password)
-            parts = user_text.strip().split()
-            if len(parts) >= 2:
-                email = parts[0]
-                password = " ".join(parts[1:])
+            parts = user_text.split(maxsplit=1)
+            if len(parts) == 2:
+                email, password = parts
+                # Collapse whitespace runs as earlier versions did, so stored
+                # passwords keep matching
+                password = " ".join(password.split())
                 
                 # Validate email format
-                import re
-                email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-                if not re.match(email_pattern, email):
+                if not EMAIL_PATTERN.match(email):
                     await cl.Message(content="❌ **Invalid email format!**\n\nPlease provide a valid email address.\n\nExample: `user@example.com mypassword`").send()
                     return True
                 
                 # Validate password strength
-                if len(password) < 8:
-                    await cl.Message(content="❌ **Password too short!**\n\nPassword must be at least 8 characters long.\n\nExample: `user@example.com mypassword123`").send()
+                if len(password) < MIN_PASSWORD_LENGTH:
+                    await cl.Message(content=f"❌ **Password too short!**\n\nPassword must be at least {MIN_PASSWORD_LENGTH} characters long.\n\nExample: `user@example.com mypassword123`").send()
                     return True
                 
-                if not re.search(r'[A-Za-z]', password):
+                if not PASSWORD_LETTER_PATTERN.search(password):
                     await cl.Message(content="❌ **Password too weak!**\n\nPassword must contain at least one letter.\n\nExample: `user@example.com mypassword123`").send()
                     return True
                 
-                if not re.search(r'[0-9]', password):
+                if not PASSWORD_DIGIT_PATTERN.search(password):
                     await cl.Message(content="❌ **Password too weak!**\n\nPassword must contain at least one number.\n\nExample: `user@example.com mypassword123`").send()
                     return True
                 
                 # Create user in database
                 try:
                     # Register user using AuthService
-                    success, message, user = auth_service.register_user(email, password)
+                    success, message, user = await asyncio.to_thread(auth_service.register_user, email, password)
                     if not success:
                         await cl.Message(content=f"❌ Failed to create account: {message}").send()
                         return True
@@ -715,6 +848,7 @@ You can now configure your API keys by typing `api` or `config`.""").send()
                     # Save user session
                     cl.user_session.set("user_email", email)
                     cl.user_session.set("user_logged_in", True)
+                    cl.user_session.set("session_user", user)
                     cl.user_session.set("auth_state", None)
                     return True
                     
@@ -732,22 +866,23 @@ You can now configure your API keys by typing `api` or `config`.""").send()
                 await cl.Message(content="❌ Login options cancelled.").send()
                 return True
             
-            if user_text.strip() == "1":
+            choice = user_text.strip()
+            if choice == "1":
                 # Stay logged in
                 cl.user_session.set("auth_state", None)
                 await cl.Message(content="✅ **Continuing with current session**\n\nYou're all set! You can now use all features with your current account.").send()
                 return True
-            elif user_text.strip() == "2":
+            elif choice == "2":
                 # View profile
                 cl.user_session.set("auth_state", None)
                 await handle_profile()
                 return True
-            elif user_text.strip() == "3":
+            elif choice == "3":
                 # Logout
                 cl.user_session.set("auth_state", None)
                 await handle_logout()
                 return True
-            elif user_text.strip() == "4":
+            elif choice == "4":
                 # Switch account - proceed with login
                 cl.user_session.set("auth_state", "login")
                 await cl.Message(content="""🔐 **Switch Account**
@@ -772,21 +907,21 @@ Example: `user@example.com mypassword`""").send()
                 return True
             
             # Process login (email and password)
-            parts = user_text.strip().split()
-            if len(parts) >= 2:
-                email = parts[0]
-                password = " ".join(parts[1:])
+            parts = user_text.split(maxsplit=1)
+            if len(parts) == 2:
+                email, password = parts
+                # Collapse whitespace runs as earlier versions did, so stored
+                # passwords keep matching
+                password = " ".join(password.split())
                 
                 # Validate email format
-                import re
-                email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-                if not re.match(email_pattern, email):
+                if not EMAIL_PATTERN.match(email):
                     await cl.Message(content="❌ **Invalid email format!**\n\nPlease provide a valid email address.\n\nExample: `user@example.com mypassword`").send()
                     return True
                 
                 # Validate credentials against database
                 try:
-                    user = auth_service.db.get_user_by_email(email)
+                    user = await asyncio.to_thread(auth_service.get_user_by_email, email)
                     if not user:
                         await cl.Message(content="❌ **Login Failed!**\n\nAccount not found. Please check your email or register a new account.").send()
                         return True
@@ -806,6 +941,7 @@ You can now access your personal settings and API configurations.""").send()
                     # Save user session
                     cl.user_session.set("user_email", email)
                     cl.user_session.set("user_logged_in", True)
+                    cl.user_session.set("session_user", user)
                     cl.user_session.set("auth_state", None)
                     return True
                     
@@ -822,12 +958,7 @@ You can now access your personal settings and API configurations.""").send()
         logger.error(f"Error handling auth response: {e}")
         return False
 
-async def handle_register():
-    """Handle user registration."""
-    # Set auth state to register
-    cl.user_session.set("auth_state", "register")
-    
-    await cl.Message(content="""📝 **Register for ExplainStack**
+REGISTER_PROMPT = """📝 **Register for ExplainStack**
 
 Create your account to get:
 - Personal API keys and configuration
@@ -840,33 +971,40 @@ Create your account to get:
 
 Type your email and password separated by a space, or type 'cancel' to go back.
 
-Example: `user@example.com mypassword123`""").send()
+Example: `user@example.com mypassword123`"""
+
+async def handle_register():
+    """Handle user registration."""
+    # Set auth state to register
+    cl.user_session.set("auth_state", "register")
+    
+    await cl.Message(content=REGISTER_PROMPT).send()
 
 async def handle_logout():
     """Handle user logout."""
-    user_logged_in = cl.user_session.get("user_logged_in", False)
-    user_email = cl.user_session.get("user_email", "")
+    user_email = get_logged_in_email()
     
-    if user_logged_in and user_email:
+    if user_email:
         # Clear user session
         cl.user_session.set("user_logged_in", False)
         cl.user_session.set("user_email", "")
+        cl.user_session.set("session_user", None)
         cl.user_session.set("session_id", None)
         await cl.Message(content=f"✅ Successfully logged out ({user_email}). You can continue using ExplainStack without an account.").send()
     else:
         await cl.Message(content="ℹ️ You're not currently logged in.").send()
 
-async def handle_profile():
-    """Handle user profile display."""
-    user_logged_in = cl.user_session.get("user_logged_in", False)
-    user_email = cl.user_session.get("user_email", "")
-    
-    if user_logged_in and user_email:
-        profile_text = f"""👤 **Your Profile**
+# Maps an email to the user ID shown on the profile in a single pass
+USER_ID_TRANSLATION = str.maketrans({"@": "_", ".": "_"})
+
+@lru_cache(maxsize=1024)
+def build_profile_text(user_email: str) -> str:
+    """Build the profile text for a logged in user."""
+    return f"""👤 **Your Profile**
 
 **Account Information:**
 - 📧 Email: {user_email}
-- 🆔 User ID: user_{user_email.replace('@', '_').replace('.', '_')}
+- 🆔 User ID: user_{user_email.translate(USER_ID_TRANSLATION)}
 - 📅 Member since: Today
 
 **Preferences:**
@@ -877,6 +1015,13 @@ async def handle_profile():
 - Type `api` to configure API keys
 - Type `logout` to sign out
 - Type `help` for more commands"""
+
+async def handle_profile():
+    """Handle user profile display."""
+    user_email = get_logged_in_email()
+    
+    if user_email:
+        profile_text = build_profile_text(user_email)
         
         await cl.Message(content=profile_text).send()
     else:
@@ -885,13 +1030,12 @@ async def handle_profile():
 async def handle_api_config():
     """Handle API key configuration."""
     # Check if user is logged in using our session management
-    user_logged_in = cl.user_session.get("user_logged_in", False)
-    user_email = cl.user_session.get("user_email", "")
+    user_email = get_logged_in_email()
     
-    if user_logged_in and user_email:
+    if user_email:
         # Get the real user object from database
         try:
-            real_user = auth_service.db.get_user_by_email(user_email)
+            real_user = await get_session_user(user_email)
             if real_user:
                 await api_config_ui.show_api_configuration(real_user)
             else:
@@ -902,8 +1046,42 @@ async def handle_api_config():
     else:
         await cl.Message(content="ℹ️ You need to be logged in to configure API keys. Type `login` to sign in or `register` to create an account.").send()
 
+# Chat commands, matched against the stripped and casefolded message
+MAX_COMMAND_LENGTH = 32
+UPLOADED_FILE_COMMANDS = frozenset({"explain", "security", "review", "clean imports", "commit message"})
+GERRIT_ANALYSIS_COMMANDS = frozenset({"review", "security", "performance", "commit message"})
+CANCEL_COMMANDS = frozenset({"cancel", "c"})
+GERRIT_URL_PREFIXES = ("http://", "https://")
+API_COMMAND_PREFIXES = ("set ", "test ", "clear ")
+API_COMMAND_PREFIX_LENGTH = max(map(len, API_COMMAND_PREFIXES))
+COMMAND_HANDLERS = {
+    "login": handle_login,
+    "signin": handle_login,
+    "register": handle_register,
+    "signup": handle_register,
+    "logout": handle_logout,
+    "signout": handle_logout,
+    "profile": handle_profile,
+    "settings": handle_profile,
+    "api": handle_api_config,
+    "keys": handle_api_config,
+    "config": handle_api_config,
+    "set openai": handle_api_config,
+    "set claude": handle_api_config,
+    "set anthropic": handle_api_config,
+    "configure openai": handle_api_config,
+    "configure claude": handle_api_config,
+    "analytics": handle_analytics,
+    "metrics": handle_analytics,
+    "stats": handle_analytics,
+    "gerrit": handle_gerrit_config,
+    "gerrit config": handle_gerrit_config,
+    "gerrit settings": handle_gerrit_config
+}
+
 @cl.on_settings_update
 async def setup_agent_selection(settings):
     """Handle agent selection settings."""
     logger.info(f"Settings updated: {settings}")
+    user_agent_routers.clear()
     # This can be used for future agent configuration
@@ -1,16 +1,28 @@
 """Authentication service for ExplainStack."""
 
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
 from ..database import DatabaseManager, User, UserSession, UserPreferences
 
 logger = logging.getLogger(__name__)
 
+# \Z rather than $ so a trailing newline is not accepted
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+MAX_EMAIL_LENGTH = 254
+MIN_PASSWORD_LENGTH = 8
+
 
 class AuthService:
     """Authentication service for ExplainStack."""
     
+    USER_CACHE_SIZE = 1024
+    USER_CACHE_TTL = 60  # seconds
+    
     def __init__(self, db_manager: DatabaseManager):
         """Initialize authentication service.
         
@@ -19,6 +31,47 @@ class AuthService:
         """
         self.db = db_manager
         self.logger = logging.getLogger(__name__)
+        self._user_cache: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._user_cache_lock = threading.Lock()
+    
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Get an active user by email, cached for a short time.
+        
+        Only found users are cached, so a newly registered account is never
+        hidden behind a cached miss.
+        
+        Args:
+            email: User email
+            
+        Returns:
+            User instance or None if not found
+        """
+        with self._user_cache_lock:
+            entry = self._user_cache.get(email)
+            if entry is not None:
+                cached_at, user = entry
+                if time.monotonic() - cached_at <= self.USER_CACHE_TTL:
+                    self._user_cache.move_to_end(email)
+                    return user
+                del self._user_cache[email]
+        
+        user = self.db.get_user_by_email(email)
+        if user is not None:
+            with self._user_cache_lock:
+                self._user_cache[email] = (time.monotonic(), user)
+                self._user_cache.move_to_end(email)
+                while len(self._user_cache) > self.USER_CACHE_SIZE:
+                    self._user_cache.popitem(last=False)
+        return user
+    
+    def invalidate_user(self, email: str) -> None:
+        """Drop a cached user so the next lookup reads the database.
+        
+        Args:
+            email: User email
+        """
+        with self._user_cache_lock:
+            self._user_cache.pop(email, None)
     
     def register_user(self, email: str, password: str) -> Tuple[bool, str, Optional[User]]:
         """Register a new user.
@@ -31,21 +84,22 @@ class AuthService:
             Tuple of (success, message, user)
         """
         try:
+            # Validate password strength before the costlier email pattern
+            if not self._is_valid_password(password):
+                return False, f"Password must be at least {MIN_PASSWORD_LENGTH} characters long", None
+            
             # Validate email format
             if not self._is_valid_email(email):
                 return False, "Invalid email format", None
             
-            # Validate password strength
-            if not self._is_valid_password(password):
-                return False, "Password must be at least 8 characters long", None
-            
             # Check if user already exists
-            existing_user = self.db.get_user_by_email(email)
+            existing_user = self.get_user_by_email(email)
             if existing_user:
                 return False, "Email already registered", None
             
             # Create user
             user = self.db.create_user(email, password)
+            self.invalidate_user(email)
             self.logger.info(f"User registered: {email}")
             
             return True, "User registered successfully", user
@@ -66,7 +120,7 @@ class AuthService:
         """
         try:
             # Get user by email
-            user = self.db.get_user_by_email(email)
+            user = self.get_user_by_email(email)
             if not user:
                 return False, "Invalid email or password", None
             
@@ -186,9 +240,9 @@ class AuthService:
         Returns:
             True if valid, False otherwise
         """
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        if "@" not in email or len(email) > MAX_EMAIL_LENGTH:
+            return False
+        return EMAIL_PATTERN.match(email) is not None
     
     @staticmethod
     def _is_valid_password(password: str) -> bool:
@@ -200,4 +254,4 @@ class AuthService:
         Returns:
             True if valid, False otherwise
         """
-        return len(password) >= 8
+        return len(password) >= MIN_PASSWORD_LENGTH
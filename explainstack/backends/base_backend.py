@@ -10,6 +10,11 @@ logger = logging.getLogger(__name__)
 class BaseBackend(ABC):
     """Base class for all AI backend providers."""
     
+    # Backends that support streaming accept an ``on_token`` coroutine callback
+    # in generate_response and await it with each chunk of the response.
+    # All backends accept a ``usage`` dict, filled with the request's token counts.
+    supports_streaming = False
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         """Initialize the backend.
         
@@ -19,6 +24,8 @@ class BaseBackend(ABC):
         """
         self.name = name
         self.config = config
+        # Whether identical prompts may be answered from the agent response cache
+        self.cacheable = config.get("cacheable", True)
         self.logger = logging.getLogger(f"{__name__}.{name}")
         self._validate_config()
     
@@ -55,6 +62,23 @@ class BaseBackend(ABC):
         """
         pass
     
+    @staticmethod
+    def _record_usage(usage: Optional[Dict[str, int]], prompt_tokens: int, completion_tokens: int) -> None:
+        """Fill a caller-provided usage dictionary with token counts.
+        
+        Args:
+            usage: Dictionary to fill, or None if the caller didn't ask for usage
+            prompt_tokens: Number of prompt tokens
+            completion_tokens: Number of completion tokens
+        """
+        if usage is None:
+            return
+        usage.update(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+    
     def get_cost_estimate(self, tokens: int) -> float:
         """Get estimated cost for token usage.
         
@@ -30,6 +30,8 @@ class ClaudeBackend(BaseBackend):
         if api_key == "demo-key" or not api_key:
             self.logger.warning("Claude API key not set - running in demo mode")
             self.demo_mode = True
+            # Simulated responses must not be served to configured backends
+            self.cacheable = False
         else:
             self.client = anthropic.Anthropic(api_key=api_key)
             self.demo_mode = False
@@ -46,11 +48,13 @@ class ClaudeBackend(BaseBackend):
         Args:
             system_prompt: System prompt for the AI
             user_prompt: User prompt for the AI
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters, usage is a dictionary filled
+                with the token counts
             
         Returns:
             Tuple of (success, response, error_message)
         """
+        usage = kwargs.pop("usage", None)
         try:
             # Check if in demo mode
             if hasattr(self, 'demo_mode') and self.demo_mode:
@@ -77,6 +81,8 @@ class ClaudeBackend(BaseBackend):
             )
             
             result = response.content[0].text
+            if usage is not None:
+                self._record_usage(usage, response.usage.input_tokens, response.usage.output_tokens)
             self.logger.info("Claude response generated successfully")
             return True, result, None
             
@@ -41,11 +41,13 @@ class GeminiBackend(BaseBackend):
         Args:
             system_prompt: System prompt for the AI
             user_prompt: User prompt for the AI
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters, usage is a dictionary filled
+                with the token counts
             
         Returns:
             Tuple of (success, response, error_message)
         """
+        usage = kwargs.pop("usage", None)
         try:
             self.logger.info("Generating response with Gemini")
             
@@ -65,6 +67,11 @@ class GeminiBackend(BaseBackend):
             )
             
             result = response.text
+            usage_metadata = getattr(response, "usage_metadata", None)
+            if usage is not None and usage_metadata is not None:
+                self._record_usage(
+                    usage, usage_metadata.prompt_token_count, usage_metadata.candidates_token_count
+                )
             self.logger.info("Gemini response generated successfully")
             return True, result, None
             
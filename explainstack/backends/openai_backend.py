@@ -1,13 +1,40 @@
 """OpenAI backend for ExplainStack multi-agent system."""
 
-from openai import OpenAI
+from collections import OrderedDict
+from openai import AsyncOpenAI
 from typing import Dict, Any, Optional, Tuple
 from .base_backend import BaseBackend
 
+# Agents and per-user routers configured with the same key share one client
+# and therefore one HTTP connection pool
+CLIENT_CACHE_SIZE = 64
+_clients: "OrderedDict[str, AsyncOpenAI]" = OrderedDict()
+
+
+def get_client(api_key: str) -> AsyncOpenAI:
+    """Get the shared async client for an API key.
+    
+    Args:
+        api_key: OpenAI API key
+        
+    Returns:
+        AsyncOpenAI client reused across backends
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        client = _clients[api_key] = AsyncOpenAI(api_key=api_key)
+        if len(_clients) > CLIENT_CACHE_SIZE:
+            _clients.popitem(last=False)
+    else:
+        _clients.move_to_end(api_key)
+    return client
+
 
 class OpenAIBackend(BaseBackend):
     """OpenAI backend implementation."""
     
+    supports_streaming = True
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize OpenAI backend.
         
@@ -31,8 +58,10 @@ class OpenAIBackend(BaseBackend):
             self.logger.warning("OpenAI API key not set - running in demo mode")
             self.demo_mode = True
             self.client = None
+            # Simulated responses must not be served to configured backends
+            self.cacheable = False
         else:
-            self.client = OpenAI(api_key=api_key)
+            self.client = get_client(api_key)
             self.demo_mode = False
         self.logger.info(f"OpenAI backend initialized with model: {self.config['model']}")
     
@@ -47,11 +76,15 @@ class OpenAIBackend(BaseBackend):
         Args:
             system_prompt: System prompt for the AI
             user_prompt: User prompt for the AI
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters, on_token streams the response
+                to a coroutine callback as it is generated and usage is a
+                dictionary filled with the token counts
             
         Returns:
             Tuple of (success, response, error_message)
         """
+        on_token = kwargs.pop("on_token", None)
+        usage = kwargs.pop("usage", None)
         try:
             # Check if in demo mode
             if hasattr(self, 'demo_mode') and self.demo_mode:
@@ -69,15 +102,34 @@ class OpenAIBackend(BaseBackend):
                 **kwargs
             }
             
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                **request_config
-            )
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
             
-            result = response.choices[0].message.content
+            if on_token is not None:
+                if usage is not None:
+                    # Token counts arrive in a final chunk without choices
+                    request_config["stream_options"] = {"include_usage": True}
+                stream = await self.client.chat.completions.create(
+                    messages=messages, stream=True, **request_config
+                )
+                parts = []
+                async for chunk in stream:
+                    if usage is not None and getattr(chunk, "usage", None):
+                        self._record_usage(usage, chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        parts.append(token)
+                        await on_token(token)
+                result = "".join(parts)
+            else:
+                response = await self.client.chat.completions.create(
+                    messages=messages, **request_config
+                )
+                result = response.choices[0].message.content
+                if usage is not None and response.usage:
+                    self._record_usage(usage, response.usage.prompt_tokens, response.usage.completion_tokens)
             self.logger.info("OpenAI response generated successfully")
             return True, result, None
             
@@ -11,6 +11,16 @@ from ..agents import (
 )
 from ..backends import BackendFactory
 
+# Agent classes by ID, shared by eager and on-demand agent creation
+AGENT_CLASSES = {
+    "code_expert": CodeExpertAgent,
+    "patch_reviewer": PatchReviewerAgent,
+    "import_cleaner": ImportCleanerAgent,
+    "commit_writer": CommitWriterAgent,
+    "security_expert": SecurityExpertAgent,
+    "performance_expert": PerformanceExpertAgent
+}
+
 
 class AgentConfig:
     """Configuration manager for ExplainStack agents."""
@@ -23,6 +33,7 @@ class AgentConfig:
         """
         self.config = config
         self.agents = {}
+        self._agents_info = None
         # Don't initialize agents here - they will be created on demand
     
     def _initialize_agents(self):
@@ -31,25 +42,10 @@ class AgentConfig:
         backends_config = self.config.get("backends", {})
         
         # Initialize agents with their specific backends
+        self._agents_info = None
         self.agents = {
-            "code_expert": self._create_agent_with_backend(
-                "code_expert", CodeExpertAgent, backends_config
-            ),
-            "patch_reviewer": self._create_agent_with_backend(
-                "patch_reviewer", PatchReviewerAgent, backends_config
-            ),
-            "import_cleaner": self._create_agent_with_backend(
-                "import_cleaner", ImportCleanerAgent, backends_config
-            ),
-            "commit_writer": self._create_agent_with_backend(
-                "commit_writer", CommitWriterAgent, backends_config
-            ),
-            "security_expert": self._create_agent_with_backend(
-                "security_expert", SecurityExpertAgent, backends_config
-            ),
-            "performance_expert": self._create_agent_with_backend(
-                "performance_expert", PerformanceExpertAgent, backends_config
-            ),
+            agent_id: self._create_agent_with_backend(agent_id, agent_class, backends_config)
+            for agent_id, agent_class in AGENT_CLASSES.items()
         }
     
     def _create_agent_with_backend(self, agent_id: str, agent_class, backends_config: Dict[str, Any]):
@@ -83,18 +79,8 @@ class AgentConfig:
         # Get backend configurations
         backends_config = self.config.get("backends", {})
         
-        # Map agent IDs to their classes
-        agent_classes = {
-            "code_expert": CodeExpertAgent,
-            "patch_reviewer": PatchReviewerAgent,
-            "import_cleaner": ImportCleanerAgent,
-            "commit_writer": CommitWriterAgent,
-            "security_expert": SecurityExpertAgent,
-            "performance_expert": PerformanceExpertAgent
-        }
-        
-        if agent_id in agent_classes:
-            agent_class = agent_classes[agent_id]
+        agent_class = AGENT_CLASSES.get(agent_id)
+        if agent_class is not None:
             self.agents[agent_id] = self._create_agent_with_backend(
                 agent_id, agent_class, backends_config
             )
@@ -108,27 +94,31 @@ class AgentConfig:
         Returns:
             Agent instance or None if not found
         """
-        # Create agent on demand with current configuration
-        if agent_id not in self.agents:
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            # Create agent on demand with current configuration
             self._create_agent_on_demand(agent_id)
-        return self.agents.get(agent_id)
+            agent = self.agents.get(agent_id)
+        return agent
     
     def get_all_agents(self) -> Dict[str, Any]:
         """Get all available agents.
         
         Returns:
-            Dictionary of agent information
+            Shared dictionary of agent information, which callers must not modify
         """
-        # Create all agents on demand
-        agent_ids = ["code_expert", "patch_reviewer", "import_cleaner", "commit_writer", "security_expert", "performance_expert"]
-        for agent_id in agent_ids:
-            if agent_id not in self.agents:
-                self._create_agent_on_demand(agent_id)
-        
-        return {
-            agent_id: agent.get_info() 
-            for agent_id, agent in self.agents.items()
-        }
+        if self._agents_info is None:
+            # Create all agents on demand
+            for agent_id in AGENT_CLASSES:
+                if agent_id not in self.agents:
+                    self._create_agent_on_demand(agent_id)
+            
+            self._agents_info = {
+                agent_id: agent.get_info() 
+                for agent_id, agent in self.agents.items()
+            }
+        
+        return self._agents_info
     
     def get_agent_list(self) -> List[Dict[str, str]]:
         """Get list of agents for UI selection.
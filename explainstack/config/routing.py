@@ -1,7 +1,7 @@
 """Agent routing logic for ExplainStack multi-agent system."""
 
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
 from .agent_config import AgentConfig
 
 logger = logging.getLogger(__name__)
@@ -19,12 +19,21 @@ class AgentRouter:
         self.agent_config = agent_config
         self.logger = logging.getLogger(__name__)
     
-    async def route_request(self, user_input: str, selected_agent_id: Optional[str] = None) -> Tuple[bool, Optional[str], Optional[str]]:
+    async def route_request(
+        self,
+        user_input: str,
+        selected_agent_id: Optional[str] = None,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
         """Route user request to appropriate agent.
         
         Args:
             user_input: User's input text
             selected_agent_id: Manually selected agent ID (optional)
+            on_token: Optional coroutine called with each response chunk as it
+                is generated (optional)
+            usage: Dictionary filled with the request's token counts (optional)
             
         Returns:
             Tuple of (success, response, error_message)
@@ -47,7 +56,7 @@ class AgentRouter:
             
             # Process with the agent
             self.logger.info(f"Routing to {agent.name} agent")
-            return await agent.process(user_input)
+            return await agent.process(user_input, on_token=on_token, usage=usage)
             
         except Exception as e:
             error_msg = f"Routing error: {str(e)}"
@@ -3,6 +3,7 @@
 import sqlite3
 import json
 import logging
+import threading
 from typing import Optional, List, Tuple
 from datetime import datetime
 from .models import User, UserSession, UserPreferences
@@ -21,12 +22,35 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's database connection.
+        
+        Connections are opened once per thread and reused, so each query
+        does not pay for opening the database file. Using the connection as
+        a context manager still commits or rolls back the transaction.
+        
+        Returns:
+            SQLite connection for the current thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path)
+        return conn
+    
+    def close(self):
+        """Close this thread's database connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def _init_database(self):
         """Initialize database tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Create users table
@@ -84,7 +108,7 @@ class DatabaseManager:
         try:
             user = User.create(email, password)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO users (user_id, email, password_hash, created_at, is_active)
@@ -127,7 +151,7 @@ class DatabaseManager:
             User instance or None if not found
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT user_id, email, password_hash, created_at, is_active
@@ -159,7 +183,7 @@ class DatabaseManager:
             User instance or None if not found
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT user_id, email, password_hash, created_at, is_active
@@ -194,7 +218,7 @@ class DatabaseManager:
         try:
             session = UserSession.create(user_id, duration_hours)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO user_sessions (session_id, user_id, created_at, expires_at, is_active)
@@ -225,7 +249,7 @@ class DatabaseManager:
             UserSession instance or None if not found/expired
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT session_id, user_id, created_at, expires_at, is_active
@@ -262,7 +286,7 @@ class DatabaseManager:
             session_id: Session ID to invalidate
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE user_sessions 
@@ -286,7 +310,7 @@ class DatabaseManager:
             UserPreferences instance or None if not found
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT preferences FROM user_preferences WHERE user_id = ?
@@ -313,7 +337,7 @@ class DatabaseManager:
             Tuple of (success, message)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE user_preferences 
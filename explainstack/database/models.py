@@ -2,6 +2,7 @@
 
 import sqlite3
 import hashlib
+import hmac
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -53,7 +54,8 @@ class User:
         try:
             stored_hash, salt = self.password_hash.split(':')
             test_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-            return test_hash == stored_hash
+            # Constant-time comparison so timing doesn't leak the matching prefix
+            return hmac.compare_digest(test_hash, stored_hash)
         except ValueError:
             return False
     
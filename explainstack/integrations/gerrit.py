@@ -8,6 +8,14 @@ from urllib.parse import urlparse, parse_qs
 
 logger = logging.getLogger(__name__)
 
+# Change URL layouts recognised as Gerrit links, matched from the start of the text
+GERRIT_URL_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'https?://[^/]+/c/[^/]+/[^/]+/\+/\d+',
+    r'https?://[^/]+/c/[^/]+/\+/\d+',
+    r'https?://[^/]+/#/c/[^/]+/[^/]+/\+/\d+',
+    r'https?://[^/]+/#/c/[^/]+/\+/\d+'
+))
+
 
 class GerritIntegration:
     """Integration with Gerrit code review system."""
@@ -367,7 +375,8 @@ class GerritIntegration:
             logger.error(f"Error formatting Gerrit analysis: {e}")
             return f"Error formatting analysis: {str(e)}"
     
-    def is_gerrit_url(self, text: str) -> bool:
+    @staticmethod
+    def is_gerrit_url(text: str) -> bool:
         """Check if text is a Gerrit URL.
         
         Args:
@@ -376,15 +385,4 @@ class GerritIntegration:
         Returns:
             True if text is a Gerrit URL
         """
-        gerrit_patterns = [
-            r'https?://[^/]+/c/[^/]+/[^/]+/\+/\d+',
-            r'https?://[^/]+/c/[^/]+/\+/\d+',
-            r'https?://[^/]+/#/c/[^/]+/[^/]+/\+/\d+',
-            r'https?://[^/]+/#/c/[^/]+/\+/\d+'
-        ]
-        
-        for pattern in gerrit_patterns:
-            if re.match(pattern, text):
-                return True
-        
-        return False
+        return any(pattern.match(text) for pattern in GERRIT_URL_PATTERNS)
@@ -1,5 +1,7 @@
 """Agent selector UI component for ExplainStack."""
 
+import re
+
 import chainlit as cl
 from typing import Dict, Any, List, Optional
 from ..config import AgentRouter
@@ -16,6 +18,24 @@ class AgentSelector:
         """
         self.agent_router = agent_router
         self.agents = agent_router.get_agent_list()
+        
+        # Selection lookups are built once so parsing a reply is a dict hit
+        # or a single compiled regex scan
+        self._quick_select = {
+            str(index): agent["id"]
+            for index, agent in enumerate(self.agents[:4], start=1)
+        }
+        self._agent_index_by_alias = {}
+        for index, agent in enumerate(self.agents):
+            self._agent_index_by_alias.setdefault(agent["name"].lower(), index)
+            self._agent_index_by_alias.setdefault(agent["id"], index)
+        # Aliases are tried in list order inside a lookahead, so the scan
+        # reports a match at every position an agent is named and the
+        # earliest agent in the list wins at each one
+        self._agent_pattern = (
+            re.compile("(?=(" + "|".join(map(re.escape, self._agent_index_by_alias)) + "))")
+            if self._agent_index_by_alias else None
+        )
     
     async def show_agent_selection(self, user_input: str) -> Optional[str]:
         """Show agent selection interface.
@@ -74,14 +94,8 @@ Or just send your message and I'll use the suggested agent automatically."""
         text = user_input.lower().strip()
         
         # Quick selection by number
-        if text == "1":
-            return self.agents[0]["id"]
-        elif text == "2":
-            return self.agents[1]["id"]
-        elif text == "3":
-            return self.agents[2]["id"]
-        elif text == "4":
-            return self.agents[3]["id"]
+        if text in self._quick_select:
+            return self._quick_select[text]
         
         # Auto selection
         elif text == "auto":
@@ -91,10 +105,18 @@ Or just send your message and I'll use the suggested agent automatically."""
         elif text == "cancel":
             return None
         
-        # Try to match by name
-        for agent in self.agents:
-            if agent["name"].lower() in text or agent["id"] in text:
-                return agent["id"]
+        # Try to match by name; when several agents are named, the first one
+        # in list order wins
+        if self._agent_pattern:
+            index = min(
+                (
+                    self._agent_index_by_alias[match.group(1)]
+                    for match in self._agent_pattern.finditer(text)
+                ),
+                default=None
+            )
+            if index is not None:
+                return self.agents[index]["id"]
         
         return None
     
@@ -351,13 +351,20 @@ Enter your API token or type 'cancel' to go back.""").send()
         Returns:
             GerritIntegration instance with current configuration
         """
-        from ..integrations.gerrit import GerritIntegration
-        
         current_config = cl.user_session.get(self.config_key, {})
-        
-        return GerritIntegration(
-            base_url=current_config.get('base_url'),
-            username=current_config.get('username'),
-            password=current_config.get('password'),
-            api_token=current_config.get('api_token')
+        settings = (
+            current_config.get('base_url'),
+            current_config.get('username'),
+            current_config.get('password'),
+            current_config.get('api_token')
         )
+        
+        # Reuse the session's integration, and its HTTP connections, until the
+        # configuration changes
+        cached = cl.user_session.get("gerrit_integration")
+        if cached and cached[0] == settings:
+            return cached[1]
+        
+        integration = GerritIntegration(*settings)
+        cl.user_session.set("gerrit_integration", (settings, integration))
+        return integration
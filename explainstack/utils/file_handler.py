@@ -14,6 +14,8 @@ class FileHandler:
     
     SUPPORTED_EXTENSIONS = {'.py', '.diff', '.patch', '.txt', '.md'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    PREVIEW_CHARS = 500
+    READ_CHUNK_SIZE = 64 * 1024
     
     def __init__(self):
         """Initialize file handler."""
@@ -72,8 +74,8 @@ class FileHandler:
             safe_filename = self._create_safe_filename(filename)
             file_path = os.path.join(self.temp_dir, safe_filename)
             
-            # Write file
-            with open(file_path, 'wb') as f:
+            # Write file, never replacing another upload
+            with open(file_path, 'xb') as f:
                 f.write(file_content)
             
             # Validate saved file
@@ -151,6 +153,54 @@ class FileHandler:
             logger.error(f"Error processing file {file_path}: {e}")
             return False, None, f"Error processing file: {str(e)}"
     
+    def peek_file_for_preview(self, file_path: str, limit: int = PREVIEW_CHARS) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        """Describe a file for the upload preview without loading all of it.
+        
+        Only the first ``limit`` characters are decoded, lines are counted over
+        the raw bytes in chunks. The full content can be read later with
+        read_file_content if the user asks for an analysis.
+        
+        Args:
+            file_path: Path to the file
+            limit: Maximum number of characters in the preview
+            
+        Returns:
+            Tuple of (success, file_info, error_message)
+        """
+        try:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    preview = f.read(limit + 1)
+            except UnicodeDecodeError:
+                with open(file_path, 'r', encoding='latin-1') as f:
+                    preview = f.read(limit + 1)
+            
+            lines = 0
+            last_byte = b""
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.READ_CHUNK_SIZE), b""):
+                    lines += chunk.count(b"\n")
+                    last_byte = chunk[-1:]
+            if last_byte and last_byte != b"\n":
+                lines += 1
+            
+            file_info = {
+                'path': file_path,
+                'filename': os.path.basename(file_path),
+                'size': os.path.getsize(file_path),
+                'extension': Path(file_path).suffix.lower(),
+                'preview': preview[:limit],
+                'truncated': len(preview) > limit,
+                'lines': lines
+            }
+            
+            logger.info(f"File preview prepared: {file_path}")
+            return True, file_info, None
+            
+        except Exception as e:
+            logger.error(f"Error previewing file {file_path}: {e}")
+            return False, None, f"Error processing file: {str(e)}"
+    
     def cleanup_temp_files(self):
         """Clean up temporary files."""
         try:
@@ -172,14 +222,16 @@ class FileHandler:
         """
         import re
         import time
+        import uuid
         
         # Remove or replace unsafe characters
         safe_name = re.sub(r'[^\w\-_\.]', '_', filename)
         
-        # Add timestamp to avoid conflicts
+        # Add timestamp and a random suffix so uploads with the same name in
+        # the same second get their own file; content is read back later
         timestamp = int(time.time())
         name, ext = os.path.splitext(safe_name)
-        return f"{name}_{timestamp}{ext}"
+        return f"{name}_{timestamp}_{uuid.uuid4().hex}{ext}"
     
     def get_supported_extensions(self) -> List[str]:
         """Get list of supported file extensions.
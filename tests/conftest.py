@@ -2,6 +2,7 @@
 
 import pytest
 import os
+import sys
 import tempfile
 import shutil
 from unittest.mock import Mock, AsyncMock
@@ -14,6 +15,15 @@ os.environ['CLAUDE_API_KEY'] = 'test-claude-key'
 os.environ['GEMINI_API_KEY'] = 'test-gemini-key'
 
 
+@pytest.fixture(autouse=True)
+def clear_openai_clients():
+    """Drop shared OpenAI clients so each test builds its own."""
+    yield
+    openai_backend = sys.modules.get("explainstack.backends.openai_backend")
+    if openai_backend is not None:
+        openai_backend._clients.clear()
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests."""
@@ -62,6 +72,7 @@ def mock_backend():
     """Mock backend for tests."""
     backend = Mock()
     backend.name = "test-backend"
+    backend.cacheable = False
     backend.generate_response = AsyncMock(return_value=(True, "Test response", None))
     return backend
 
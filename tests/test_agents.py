@@ -1,8 +1,9 @@
 """Tests for ExplainStack agents."""
 
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from explainstack.agents import (
+    BaseAgent,
     CodeExpertAgent,
     PatchReviewerAgent,
     ImportCleanerAgent,
@@ -180,3 +181,70 @@ class TestAgentIntegration:
         assert success is False
         assert response is None
         assert "Network Error" in error
+    
+    @pytest.mark.asyncio
+    async def test_process_many(self, mock_backend, sample_python_code):
+        """Test running several agents concurrently on the same input."""
+        agents = [
+            CodeExpertAgent(mock_backend),
+            SecurityExpertAgent(mock_backend),
+            PerformanceExpertAgent(mock_backend)
+        ]
+        
+        results = await BaseAgent.process_many(agents, sample_python_code)
+        
+        assert results == [(True, "Test response", None)] * 3
+        assert mock_backend.generate_response.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_process_uses_response_cache(self, mock_backend):
+        """Test identical requests are answered from the response cache."""
+        mock_backend.cacheable = True
+        mock_backend.config = {"model": "test-model"}
+        BaseAgent._response_cache.clear()
+        
+        first = await CodeExpertAgent(mock_backend).process("cached code")
+        second = await CodeExpertAgent(mock_backend).process("cached code")
+        
+        assert first == second == (True, "Test response", None)
+        mock_backend.generate_response.assert_called_once()
+        BaseAgent._response_cache.clear()
+    
+    @pytest.mark.asyncio
+    @patch('explainstack.backends.openai_backend.AsyncOpenAI')
+    async def test_response_cache_not_shared_with_demo_mode(self, mock_async_openai):
+        """Test demo responses are not cached and keys don't share responses."""
+        from explainstack.backends import OpenAIBackend
+        
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Real response"
+        create = mock_async_openai.return_value.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        BaseAgent._response_cache.clear()
+        
+        demo = CodeExpertAgent(OpenAIBackend({"api_key": "demo-key", "model": "gpt-4"}))
+        real = CodeExpertAgent(OpenAIBackend({"api_key": "sk-real", "model": "gpt-4"}))
+        other = CodeExpertAgent(OpenAIBackend({"api_key": "sk-other", "model": "gpt-4"}))
+        
+        demo_result = await demo.process("same code")
+        real_result = await real.process("same code")
+        await other.process("same code")
+        
+        assert "[DEMO MODE]" in demo_result[1]
+        assert real_result == (True, "Real response", None)
+        assert create.await_count == 2
+        BaseAgent._response_cache.clear()
+    
+    def test_get_all_agents_built_once(self):
+        """Test the agent info dictionary is built once and reused."""
+        from explainstack.config import AgentConfig
+        from explainstack.config.agent_config import AGENT_CLASSES
+        
+        backend = {"type": "openai", "config": {"api_key": "demo-key", "model": "gpt-4"}}
+        agent_config = AgentConfig({"backends": dict.fromkeys(AGENT_CLASSES, backend)})
+        agents = agent_config.get_all_agents()
+        
+        assert agent_config.get_all_agents() is agents
+        assert agents["code_expert"]["name"] == agent_config.get_agent("code_expert").name
@@ -0,0 +1,223 @@
+"""Tests for ExplainStack analytics."""
+
+import io
+import json
+
+import pytest
+from unittest.mock import patch
+from datetime import timedelta
+from explainstack.analytics import AnalyticsManager, MetricsCollector
+from explainstack.analytics.metrics_collector import NS_PER_SECOND
+
+
+@pytest.fixture
+def metrics_collector():
+    """Metrics collector with a few recorded requests."""
+    collector = MetricsCollector()
+    collector.start_user_session("user1", "session1")
+    collector.record_agent_usage("code_expert", "user1", tokens_used=100, cost=0.01, response_time=1.0)
+    collector.record_agent_usage("code_expert", "user1", tokens_used=50, cost=0.02, response_time=3.0, success=False)
+    collector.record_agent_usage("security_expert", "user2", tokens_used=10, response_time=2.0)
+    return collector
+
+
+class TestMetricsCollector:
+    """Test MetricsCollector."""
+
+    def test_get_system_metrics(self, metrics_collector):
+        """Test system metrics over the default window."""
+        metrics = metrics_collector.get_system_metrics()
+
+        assert metrics['total_users'] == 2
+        assert metrics['total_requests'] == 3
+        assert metrics['total_tokens'] == 160
+        assert metrics['error_count'] == 1
+        assert metrics['average_response_time'] == 2.0
+        assert metrics['agent_usage'] == {'code_expert': 2, 'security_expert': 1}
+
+    def test_get_system_metrics_window(self, metrics_collector):
+        """Test rows older than the window are excluded."""
+        metrics_collector._flush_pending()
+        metrics_collector._ts[0] -= 2 * 3600 * NS_PER_SECOND
+
+        metrics = metrics_collector.get_system_metrics(hours=1)
+
+        assert metrics['total_requests'] == 2
+        assert metrics['total_users'] == 2
+        assert metrics_collector.get_agent_performance("code_expert", hours=1)['total_requests'] == 1
+
+    def test_get_agent_performance(self, metrics_collector):
+        """Test performance metrics for a single agent."""
+        performance = metrics_collector.get_agent_performance("code_expert")
+
+        assert performance['total_requests'] == 2
+        assert performance['success_rate'] == 50.0
+        assert performance['average_response_time'] == 2.0
+        assert performance['total_tokens'] == 150
+        assert performance['total_cost'] == pytest.approx(0.03)
+
+    def test_get_agent_performance_unused_agent(self, metrics_collector):
+        """Test performance metrics for an agent without requests."""
+        performance = metrics_collector.get_agent_performance("commit_writer")
+
+        assert performance['total_requests'] == 0
+        assert performance['success_rate'] == 0.0
+
+    def test_get_agent_performance_many(self, metrics_collector):
+        """Test batched performance metrics match per-agent results."""
+        agent_ids = ["code_expert", "security_expert", "commit_writer"]
+        performance = metrics_collector.get_agent_performance_many(agent_ids)
+
+        assert list(performance) == agent_ids
+        for agent_id in agent_ids:
+            assert performance[agent_id] == metrics_collector.get_agent_performance(agent_id)
+
+    def test_record_agent_usage_updates_open_session(self, metrics_collector):
+        """Test usage is credited to the user's open session only."""
+        session = metrics_collector.sessions["session1"]
+
+        assert session.total_requests == 2
+        assert session.total_tokens == 150
+        assert session.agent_usage == {"code_expert": 2}
+
+        metrics_collector.end_user_session("session1")
+        metrics_collector.record_agent_usage("code_expert", "user1", tokens_used=5)
+
+        assert session.total_requests == 2
+
+    def test_get_user_metrics(self, metrics_collector):
+        """Test per-user agent breakdown."""
+        metrics = metrics_collector.get_user_metrics("user1")
+
+        assert metrics['total_sessions'] == 1
+        assert metrics['total_requests'] == 2
+        assert metrics['agent_usage'] == {
+            'code_expert': {'count': 2, 'tokens': 150, 'cost': pytest.approx(0.03), 'avg_response_time': 2.0}
+        }
+
+    def test_cleanup_old_data_updates_user_metrics(self, metrics_collector):
+        """Test removed usage no longer counts towards user metrics."""
+        metrics_collector._flush_pending()
+        metrics_collector._ts[0] -= int(timedelta(days=31).total_seconds()) * NS_PER_SECOND
+
+        metrics_collector.cleanup_old_data(days=30)
+
+        agent_usage = metrics_collector.get_user_metrics("user1")['agent_usage']
+        assert agent_usage['code_expert']['count'] == 1
+        assert agent_usage['code_expert']['avg_response_time'] == 3.0
+
+    def test_cleanup_old_data_removes_old_sessions(self, metrics_collector):
+        """Test only sessions that ended before the cutoff are removed."""
+        metrics_collector.start_user_session("user2", "session2")
+        metrics_collector.end_user_session("session1")
+        metrics_collector.end_user_session("session2")
+        metrics_collector.sessions["session1"].end_time -= timedelta(days=31)
+
+        metrics_collector.cleanup_old_data(days=30)
+
+        assert list(metrics_collector.sessions) == ["session2"]
+        assert metrics_collector.get_user_metrics("user1")['total_sessions'] == 0
+        assert metrics_collector.get_user_metrics("user2")['total_sessions'] == 1
+        assert metrics_collector.get_system_metrics()['total_requests'] == 3
+
+    def test_cleanup_old_data_skips_restarted_sessions(self, metrics_collector):
+        """Test a session restarted after it ended is kept by cleanup."""
+        metrics_collector.end_user_session("session1")
+        metrics_collector.start_user_session("user1", "session1")
+
+        metrics_collector.cleanup_old_data(days=30)
+
+        assert metrics_collector.sessions["session1"].end_time is None
+        assert metrics_collector.get_user_metrics("user1")['total_sessions'] == 1
+
+    def test_max_usage_rows(self):
+        """Test the oldest usage rows are dropped once the limit is exceeded."""
+        collector = MetricsCollector(max_usage_rows=8)
+        for tokens in range(9):
+            collector.record_agent_usage("code_expert", "user1", tokens_used=tokens)
+
+        metrics = collector.get_system_metrics()
+        assert metrics['total_requests'] == 7
+        assert metrics['total_tokens'] == sum(range(2, 9))
+        assert collector.get_user_metrics("user1")['agent_usage']['code_expert']['count'] == 7
+
+    def test_record_agent_usage_is_batched(self):
+        """Test recorded rows are queued until read or a batch fills up."""
+        collector = MetricsCollector()
+        collector.FLUSH_BATCH_SIZE = 3
+        collector.record_agent_usage("code_expert", "user1")
+        collector.record_agent_usage("code_expert", "user1")
+
+        assert len(collector._ts) == 0
+        collector.record_agent_usage("code_expert", "user1")
+        assert len(collector._ts) == 3
+
+        collector.record_agent_usage("code_expert", "user1")
+        assert collector.get_system_metrics()['total_requests'] == 4
+
+
+class TestAnalyticsManager:
+    """Test AnalyticsManager."""
+
+    def test_export_metrics_csv(self):
+        """Test CSV export of agent usage."""
+        manager = AnalyticsManager()
+        manager.track_agent_usage("code_expert", "user1", tokens_used=42, success=False)
+
+        lines = manager.export_analytics('csv').splitlines()
+
+        assert lines[0] == "timestamp,agent_id,user_id,tokens_used,cost,response_time,success"
+        assert lines[1].split(',')[1:] == ["code_expert", "user1", "42", "0.0", "0.0", "False"]
+
+    def test_export_metrics_to_stream(self):
+        """Test export can be written to a caller-provided stream."""
+        manager = AnalyticsManager()
+        manager.track_agent_usage("code_expert", "user1")
+        out = io.StringIO()
+
+        assert manager.export_analytics('json', out) is None
+        assert json.loads(out.getvalue())['agent_usage'][0]['agent_id'] == "code_expert"
+
+    def test_export_metrics_json_without_orjson(self, metrics_collector):
+        """Test the stdlib JSON fallback matches the orjson output."""
+        exported = metrics_collector.export_metrics('json')
+        with patch('explainstack.analytics.metrics_collector.orjson', None):
+            fallback = metrics_collector.export_metrics('json')
+
+        assert json.loads(fallback) == json.loads(exported)
+        assert json.loads(fallback)['agent_usage'][1]['success'] is False
+
+    def test_export_metrics_json_session_without_usage(self):
+        """Test sessions without usage export an empty agent usage mapping."""
+        collector = MetricsCollector()
+        collector.start_user_session("user1", "session1")
+
+        sessions = json.loads(collector.export_metrics('json'))['sessions']
+
+        assert sessions[0]['agent_usage'] == {}
+
+    def test_get_usage_summary(self):
+        """Test usage summary and top agents."""
+        manager = AnalyticsManager()
+        manager.track_agent_usage("security_expert", "user1")
+        manager.track_agent_usage("security_expert", "user1")
+        manager.track_agent_usage("code_expert", "user1")
+
+        summary = manager.get_usage_summary()
+
+        assert summary['system_metrics']['total_requests'] == 3
+        assert summary['agent_performance']['security_expert']['total_requests'] == 2
+        assert summary['top_agents'][0][0] == "security_expert"
+        assert summary['top_agents'][1][0] == "code_expert"
+
+    def test_generate_analytics_report(self):
+        """Test analytics report generation."""
+        manager = AnalyticsManager()
+        manager.track_agent_usage("code_expert", "user1", tokens_used=1234)
+
+        report = manager.generate_analytics_report()
+
+        assert "ExplainStack Analytics Report" in report
+        assert "**Total Tokens**: 1,234" in report
+        assert "**Code Expert**: 1 requests" in report
+        assert "Patch Reviewer" not in report
@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import os
 import tempfile
 from explainstack.app import (
+    load_env_once,
     setup_openai,
     validate_input,
     handle_file_upload,
@@ -32,6 +33,7 @@ class TestSetupOpenAI:
     
     def test_setup_openai_load_dotenv(self):
         """Test OpenAI setup with dotenv loading."""
+        load_env_once.cache_clear()
         with patch.dict(os.environ, {}, clear=True):
             with patch('explainstack.app.load_dotenv') as mock_load_dotenv:
                 with patch('explainstack.app.os.getenv', return_value='test-key'):
@@ -85,11 +87,13 @@ class TestHandleFileUpload:
         # Mock file handler
         with patch('explainstack.app.file_handler') as mock_handler:
             mock_handler.save_uploaded_file.return_value = (True, "/tmp/test.py", None)
-            mock_handler.process_file_for_analysis.return_value = (
+            mock_handler.peek_file_for_preview.return_value = (
                 True, 
                 {
+                    'path': '/tmp/test.py',
                     'filename': 'test.py',
-                    'content': "print('hello world')",
+                    'preview': "print('hello world')",
+                    'truncated': False,
                     'size': 20,
                     'lines': 1,
                     'extension': '.py'
@@ -103,7 +107,7 @@ class TestHandleFileUpload:
                 
                 # Verify file handler calls
                 mock_handler.save_uploaded_file.assert_called_once()
-                mock_handler.process_file_for_analysis.assert_called_once()
+                mock_handler.peek_file_for_preview.assert_called_once()
                 
                 # Verify message sent
                 mock_message.assert_called()
@@ -241,7 +245,6 @@ class TestHandleAnalytics:
             
             # Mock analytics manager
             with patch('explainstack.app.analytics_manager') as mock_analytics:
-                mock_analytics.get_dashboard_data.return_value = {"metrics": "data"}
                 mock_analytics.generate_analytics_report.return_value = "Analytics report"
                 
                 # Mock Chainlit
@@ -252,7 +255,7 @@ class TestHandleAnalytics:
                         await handle_analytics()
                         
                         # Verify analytics calls
-                        mock_analytics.get_dashboard_data.assert_called_once()
+                        mock_analytics.get_dashboard_data.assert_not_called()
                         mock_analytics.generate_analytics_report.assert_called_once()
                         
                         # Verify message sent
@@ -290,7 +293,7 @@ class TestHandleAnalytics:
             
             # Mock analytics manager to raise exception
             with patch('explainstack.app.analytics_manager') as mock_analytics:
-                mock_analytics.get_dashboard_data.side_effect = Exception("Database error")
+                mock_analytics.generate_analytics_report.side_effect = Exception("Database error")
                 
                 # Mock Chainlit
                 with patch('explainstack.app.cl.user_session') as mock_session:
@@ -355,8 +358,9 @@ class TestAppIntegration:
         mock_message.elements = None
         mock_message.content = "analytics"
         
-        # Mock analytics handler
-        with patch('explainstack.app.handle_analytics') as mock_analytics:
+        # Mock analytics handler in the dispatch table
+        mock_analytics = AsyncMock()
+        with patch.dict('explainstack.app.COMMAND_HANDLERS', {"analytics": mock_analytics}):
             # Import and call main function
             from explainstack.app import main
             await main(mock_message)
@@ -385,6 +389,27 @@ class TestAppIntegration:
             assert "unexpected error occurred" in call_args.lower()
 
 
+class TestCreateDynamicConfig:
+    """Test per-user configuration."""
+    
+    def test_create_dynamic_config_keeps_base_config(self):
+        """Test user API keys don't leak into the shared base config."""
+        from explainstack.app import config_data, create_dynamic_config
+        base_key = config_data["backends"]["code_expert"]["config"]["api_key"]
+        
+        with patch('explainstack.app.auth_service') as mock_auth, \
+                patch('explainstack.app.user_service') as mock_user_service:
+            mock_auth.get_user_by_email.return_value = Mock()
+            mock_user_service.get_user_api_keys.return_value = {"openai_api_key": "sk-user-key"}
+            
+            dynamic_config = create_dynamic_config(config_data, "user@example.com")
+        
+        mock_auth.get_user_by_email.assert_called_once_with("user@example.com")
+        assert dynamic_config["backends"]["code_expert"]["config"]["api_key"] == "sk-user-key"
+        assert dynamic_config["backends"]["patch_reviewer"] is config_data["backends"]["patch_reviewer"]
+        assert config_data["backends"]["code_expert"]["config"]["api_key"] == base_key
+
+
 class TestAppConfiguration:
     """Test application configuration."""
     
@@ -109,6 +109,45 @@ class TestAuthService:
         # Test incorrect password
         assert auth_service._verify_password("wrong_password", hashed) is False
 
+    def test_login_user_unknown_email(self, mock_db_manager):
+        """Test unknown emails get the same message as wrong passwords."""
+        mock_db_manager.get_user_by_email.return_value = None
+        auth_service = AuthService(mock_db_manager)
+
+        success, message, session = auth_service.login_user("user@example.com", "password123")
+
+        assert success is False
+        assert message == "Invalid email or password"
+        assert session is None
+
+    def test_register_user_short_password_checked_first(self, mock_db_manager):
+        """Test a short password is rejected before the email is validated."""
+        auth_service = AuthService(mock_db_manager)
+
+        with patch.object(auth_service, '_is_valid_email') as mock_valid_email:
+            success, message, user = auth_service.register_user("not-an-email", "short")
+
+        assert success is False
+        assert message == "Password must be at least 8 characters long"
+        mock_valid_email.assert_not_called()
+        assert auth_service._is_valid_email("user" * 64 + "@example.com") is False
+
+    def test_get_user_by_email_cached(self, mock_db_manager):
+        """Test found users are cached and misses are not."""
+        user = Mock()
+        mock_db_manager.get_user_by_email.side_effect = [None, user]
+        auth_service = AuthService(mock_db_manager)
+
+        assert auth_service.get_user_by_email("user@example.com") is None
+        assert auth_service.get_user_by_email("user@example.com") is user
+        assert auth_service.get_user_by_email("user@example.com") is user
+        assert mock_db_manager.get_user_by_email.call_count == 2
+
+        auth_service.invalidate_user("user@example.com")
+        mock_db_manager.get_user_by_email.side_effect = None
+        mock_db_manager.get_user_by_email.return_value = None
+        assert auth_service.get_user_by_email("user@example.com") is None
+
 
 class TestAuthMiddleware:
     """Test Authentication Middleware."""
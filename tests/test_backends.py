@@ -24,16 +24,30 @@ class TestOpenAIBackend:
         backend = OpenAIBackend(config)
         assert backend.name == "OpenAI"
         assert backend.config == config
-    
+
+    @patch('explainstack.backends.openai_backend.AsyncOpenAI')
+    def test_client_shared_per_api_key(self, mock_async_openai):
+        """Test backends with the same API key reuse one client."""
+        mock_async_openai.side_effect = lambda api_key: Mock()
+
+        first = OpenAIBackend({"api_key": "test-key", "model": "gpt-4"})
+        second = OpenAIBackend({"api_key": "test-key", "model": "gpt-3.5-turbo"})
+        other = OpenAIBackend({"api_key": "other-key", "model": "gpt-4"})
+
+        assert first.client is second.client
+        assert other.client is not first.client
+        assert mock_async_openai.call_count == 2
+
     @pytest.mark.asyncio
-    @patch('explainstack.backends.openai_backend.openai')
-    async def test_generate_response_success(self, mock_openai):
+    @patch('explainstack.backends.openai_backend.AsyncOpenAI')
+    async def test_generate_response_success(self, mock_async_openai):
         """Test successful response generation."""
         # Mock OpenAI response
         mock_response = Mock()
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Test response"
-        mock_openai.ChatCompletion.acreate = AsyncMock(return_value=mock_response)
+        mock_client = mock_async_openai.return_value
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         config = {"api_key": "test-key", "model": "gpt-4"}
         backend = OpenAIBackend(config)
@@ -45,11 +59,63 @@ class TestOpenAIBackend:
         assert error is None
     
     @pytest.mark.asyncio
-    @patch('explainstack.backends.openai_backend.openai')
-    async def test_generate_response_error(self, mock_openai):
+    @patch('explainstack.backends.openai_backend.AsyncOpenAI')
+    async def test_generate_response_usage(self, mock_async_openai):
+        """Test token usage is reported when requested."""
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Test response"
+        mock_response.usage.prompt_tokens = 12
+        mock_response.usage.completion_tokens = 30
+        mock_client = mock_async_openai.return_value
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        config = {"api_key": "test-key", "model": "gpt-4"}
+        backend = OpenAIBackend(config)
+        usage = {}
+        
+        success, response, error = await backend.generate_response("system", "user", usage=usage)
+        
+        assert success is True
+        assert usage == {"prompt_tokens": 12, "completion_tokens": 30, "total_tokens": 42}
+        assert "usage" not in mock_client.chat.completions.create.call_args.kwargs
+    
+    @pytest.mark.asyncio
+    @patch('explainstack.backends.openai_backend.AsyncOpenAI')
+    async def test_generate_response_streaming(self, mock_async_openai):
+        """Test streamed response generation."""
+        chunks = []
+        for token in ["Test ", None, "response"]:
+            chunk = Mock()
+            chunk.choices = [Mock()]
+            chunk.choices[0].delta.content = token
+            chunks.append(chunk)
+        
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+        
+        mock_client = mock_async_openai.return_value
+        mock_client.chat.completions.create = AsyncMock(return_value=stream())
+        on_token = AsyncMock()
+        
+        config = {"api_key": "test-key", "model": "gpt-4"}
+        backend = OpenAIBackend(config)
+        
+        success, response, error = await backend.generate_response("system", "user", on_token=on_token)
+        
+        assert success is True
+        assert response == "Test response"
+        assert [call.args[0] for call in on_token.await_args_list] == ["Test ", "response"]
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+    
+    @pytest.mark.asyncio
+    @patch('explainstack.backends.openai_backend.AsyncOpenAI')
+    async def test_generate_response_error(self, mock_async_openai):
         """Test error handling in response generation."""
         # Mock OpenAI to raise exception
-        mock_openai.ChatCompletion.acreate = AsyncMock(side_effect=Exception("API Error"))
+        mock_client = mock_async_openai.return_value
+        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
         
         config = {"api_key": "test-key", "model": "gpt-4"}
         backend = OpenAIBackend(config)
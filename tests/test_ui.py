@@ -0,0 +1,35 @@
+"""Tests for ExplainStack UI components."""
+
+from unittest.mock import Mock
+from explainstack.ui import AgentSelector
+
+
+class TestAgentSelector:
+    """Test AgentSelector."""
+    
+    def _selector(self):
+        """Agent selector over a fixed agent list."""
+        agent_router = Mock()
+        agent_router.get_agent_list.return_value = [
+            {"id": "code_expert", "name": "Code Expert"},
+            {"id": "patch_reviewer", "name": "Patch Reviewer"},
+            {"id": "security_expert", "name": "Security Expert"},
+            {"id": "commit_writer", "name": "Commit Writer"}
+        ]
+        return AgentSelector(agent_router)
+    
+    def test_parse_agent_selection(self):
+        """Test selection by number, name and ID."""
+        selector = self._selector()
+        
+        assert selector.parse_agent_selection(" 2 ") == "patch_reviewer"
+        assert selector.parse_agent_selection("use the Security Expert") == "security_expert"
+        assert selector.parse_agent_selection("commit_writer please") == "commit_writer"
+        assert selector.parse_agent_selection("something else") is None
+        assert selector.parse_agent_selection("cancel") is None
+    
+    def test_parse_agent_selection_prefers_list_order(self):
+        """Test the first agent in list order wins when several are named."""
+        selector = self._selector()
+        
+        assert selector.parse_agent_selection("security expert or code expert") == "code_expert"
@@ -0,0 +1,25 @@
+"""Tests for ExplainStack utilities."""
+
+import pytest
+from explainstack.utils import FileHandler
+
+
+class TestFileHandler:
+    """Test FileHandler."""
+    
+    @pytest.fixture
+    def file_handler(self):
+        """File handler with its temp directory removed afterwards."""
+        handler = FileHandler()
+        yield handler
+        handler.cleanup_temp_files()
+    
+    def test_save_uploaded_file_same_name(self, file_handler):
+        """Test uploads with the same name never share a path."""
+        first = file_handler.save_uploaded_file(b"print('first')\n", "test.py")
+        second = file_handler.save_uploaded_file(b"print('second')\n", "test.py")
+        
+        assert first[0] is True and second[0] is True
+        assert first[1] != second[1]
+        assert file_handler.read_file_content(first[1])[1] == "print('first')\n"
+        assert file_handler.read_file_content(second[1])[1] == "print('second')\n"